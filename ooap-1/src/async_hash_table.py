@@ -0,0 +1,129 @@
+import asyncio
+import hash_table as ht
+import power_set as ps
+import native_dictionary as nd
+
+DEFAULT_YIELD_EVERY = 1000
+
+
+# Iterates over values, returning control to the event loop every 'yield_every' items
+async def cooperative(values, yield_every=DEFAULT_YIELD_EVERY):
+    for i, value in enumerate(values):
+        if i % yield_every == yield_every - 1:
+            await asyncio.sleep(0)
+        yield value
+
+
+# Iterates over unique values of any HashTable
+def table_values(table):
+    for bucket in table.data:
+        if bucket is None:
+            continue
+        for value, _ in bucket:
+            yield value
+
+
+# Runs a blocking bulk operation in the executor
+# Pre-condition: nobody modifies the structure until the operation is finished
+async def run_in_executor(executor, function, *args):
+    return await asyncio.get_running_loop().run_in_executor(executor, function, *args)
+
+
+# Hash table with bulk operations that do not block the event loop
+# Bulk operations either yield to the loop every 'yield_every' items
+# or, if an executor is given, move the whole phase out of the loop
+class AsyncHashTable(ht.HashTable):
+    def __init__(self, capacity=ht.HashTable.DEFAULT_CAPACITY, yield_every=DEFAULT_YIELD_EVERY):
+        super().__init__(capacity)
+        self.yield_every = yield_every
+
+    def __put_all(self, values):
+        for value in values:
+            self.put(value)
+
+    def __remove_all(self, values):
+        for value in values:
+            self.remove(value)
+
+    # Async iterator over (value, count) entries
+    async def entries(self):
+        async for bucket in cooperative(self.data, self.yield_every):
+            if bucket is None:
+                continue
+            for entry in bucket:
+                yield entry
+
+    # Post-condition: all values are put, put status is the status of the last put
+    async def put_many(self, values, executor=None):
+        if executor is not None:
+            await run_in_executor(executor, self.__put_all, values)
+            return
+        async for value in cooperative(values, self.yield_every):
+            self.put(value)
+
+    # Post-condition: all values are removed, remove status is the status of the last remove
+    async def remove_many(self, values, executor=None):
+        if executor is not None:
+            await run_in_executor(executor, self.__remove_all, values)
+            return
+        async for value in cooperative(values, self.yield_every):
+            self.remove(value)
+
+
+class AsyncPowerSet(AsyncHashTable, ps.PowerSet):
+    def __init__(self, capacity, yield_every=DEFAULT_YIELD_EVERY):
+        super().__init__(capacity, yield_every)
+
+    def __new_set(self, capacity):
+        return AsyncPowerSet(capacity, self.yield_every)
+
+    async def __filter_seek(self, other, expected, executor):
+        values = list(table_values(self))
+        if executor is not None:
+            return await run_in_executor(executor, lambda: [v for v in values if other.seek(v) == expected])
+        return [value async for value in cooperative(values, self.yield_every) if other.seek(value) == expected]
+
+    async def intersection_async(self, other, executor=None):
+        result = self.__new_set(min(self.capacity, other.capacity))
+        await result.put_many(await self.__filter_seek(other, True, executor), executor)
+        return result
+
+    async def union_async(self, other, executor=None):
+        result = self.__new_set(self.capacity + other.capacity)
+        await result.put_many(table_values(self), executor)
+        await result.put_many(table_values(other), executor)
+        return result
+
+    async def difference_async(self, other, executor=None):
+        result = self.__new_set(max(self.capacity, other.capacity))
+        await result.put_many(await self.__filter_seek(other, False, executor), executor)
+        return result
+
+    async def is_subset_async(self, other):
+        async for value in cooperative(table_values(other), self.yield_every):
+            if not self.seek(value):
+                return False
+        return True
+
+
+class AsyncNativeDictionary(nd.NativeDictionary):
+    def __init__(self, capacity=nd.NativeDictionary.DEFAULT_CAPACITY, yield_every=DEFAULT_YIELD_EVERY):
+        super().__init__(capacity)
+        self.yield_every = yield_every
+
+    def __put_all(self, items):
+        for key, value in items:
+            self.put(key, value)
+
+    # Async iterator over (key, value) pairs
+    async def entries(self):
+        async for item in cooperative(self.items(), self.yield_every):
+            yield item
+
+    # Post-condition: all (key, value) pairs are put, put status is the status of the last put
+    async def put_many(self, items, executor=None):
+        if executor is not None:
+            await run_in_executor(executor, self.__put_all, items)
+            return
+        async for key, value in cooperative(items, self.yield_every):
+            self.put(key, value)
@@ -17,26 +17,32 @@ class AbstractBloomFilter(ABC):
         pass
 
 
+HASH1_MULTIPLIER = 17
+HASH2_MULTIPLIER = 223
+
+
 def _bit_mask(bit):
     return 1 << bit
 
 
+# Polynomial string hash in range [0, modulus)
+def polynomial_hash(str1, multiplier, modulus):
+    result = 0
+    for c in str1:
+        result = (result * multiplier + ord(c)) % modulus
+    return result
+
+
 class BloomFilter(AbstractBloomFilter):
     def __init__(self, filter_len):
         self.filter_len = filter_len
         self.filter = 0
 
     def __hash1(self, str1):
-        result = 0
-        for c in str1:
-            result = (result * 17 + ord(c)) % self.filter_len
-        return result
+        return polynomial_hash(str1, HASH1_MULTIPLIER, self.filter_len)
 
     def __hash2(self, str1):
-        result = 0
-        for c in str1:
-            result = (result * 223 + ord(c)) % self.filter_len
-        return result
+        return polynomial_hash(str1, HASH2_MULTIPLIER, self.filter_len)
 
     def __set_bit(self, bit):
         self.filter |= _bit_mask(bit)
@@ -0,0 +1,101 @@
+import threading
+from hash_table import AbstractHashTable, SeekStatus, PutStatus, RemoveStatus
+
+
+# Splits bucket indices into contiguous ranges, every range is guarded by its own lock
+class LockStripes:
+    DEFAULT_STRIPES = 16
+
+    def __init__(self, capacity, stripes=DEFAULT_STRIPES):
+        self.capacity = capacity
+        self.locks = [threading.Lock() for _ in range(max(1, min(stripes, capacity)))]
+
+    def lock_for(self, index):
+        return self.locks[index * len(self.locks) // self.capacity]
+
+
+# Statuses are stored per thread, so concurrent callers do not overwrite each other's results
+class ThreadStatuses(threading.local):
+    def __init__(self, **defaults):
+        self.__dict__.update(defaults)
+
+
+# Thread-safe hash table
+# Buckets are immutable tuples: writers build a new bucket under the stripe lock and publish it
+# with a single reference assignment, so readers never take locks and always see a whole bucket
+class ConcurrentHashTable(AbstractHashTable):
+    DEFAULT_CAPACITY = 21
+    VALUE_INDEX = 0
+    COUNT_INDEX = 1
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, stripes=LockStripes.DEFAULT_STRIPES):
+        self.data = [None] * capacity
+        self.capacity = capacity
+        self.__stripes = LockStripes(capacity, stripes)
+        self.__size_lock = threading.Lock()
+        self.__size = 0
+        self.__statuses = ThreadStatuses(seek=SeekStatus.Nil, put=PutStatus.Nil, remove=RemoveStatus.Nil)
+
+    def size(self):
+        return self.__size
+
+    def __hash_fun(self, value):
+        return sum([ord(ch) for ch in value]) % self.capacity
+
+    def __get_index(self, value):
+        return self.__hash_fun(value) % self.capacity
+
+    def __add_size(self, delta):
+        with self.__size_lock:
+            self.__size += delta
+
+    def seek(self, value):
+        if value is None:
+            self.__statuses.seek = SeekStatus.IsNone
+            return False
+        self.__statuses.seek = SeekStatus.Ok
+        bucket = self.data[self.__get_index(value)]
+        return bucket is not None and any(entry[self.VALUE_INDEX] == value for entry in bucket)
+
+    def put(self, value):
+        if value is None:
+            self.__statuses.put = PutStatus.IsNone
+            return
+        index = self.__get_index(value)
+        with self.__stripes.lock_for(index):
+            bucket = self.data[index] or ()
+            for i, (stored_value, count) in enumerate(bucket):
+                if stored_value == value:
+                    self.data[index] = bucket[:i] + ((value, count + 1),) + bucket[i + 1:]
+                    break
+            else:
+                self.data[index] = bucket + ((value, 1),)
+            self.__add_size(1)
+        self.__statuses.put = PutStatus.Ok
+
+    def remove(self, value):
+        if value is None:
+            self.__statuses.remove = RemoveStatus.IsNone
+            return
+        index = self.__get_index(value)
+        with self.__stripes.lock_for(index):
+            bucket = self.data[index] or ()
+            for i, (stored_value, count) in enumerate(bucket):
+                if stored_value != value:
+                    continue
+                rest = ((value, count - 1),) if count > 1 else ()
+                new_bucket = bucket[:i] + rest + bucket[i + 1:]
+                self.data[index] = new_bucket if len(new_bucket) > 0 else None
+                self.__add_size(-1)
+                self.__statuses.remove = RemoveStatus.Ok
+                return
+        self.__statuses.remove = RemoveStatus.NotFound
+
+    def get_seek_status(self):
+        return self.__statuses.seek
+
+    def get_put_status(self):
+        return self.__statuses.put
+
+    def get_remove_status(self):
+        return self.__statuses.remove
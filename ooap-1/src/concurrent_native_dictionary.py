@@ -0,0 +1,87 @@
+import threading
+from native_dictionary import AbstractNativeDictionary, ExistsStatus, GetStatus, PutStatus
+from concurrent_hash_table import LockStripes, ThreadStatuses
+
+
+# Thread-safe dictionary
+# Unlike NativeDictionary, collisions are resolved by chaining into immutable tuple buckets:
+# open addressing probes across stripe boundaries, chaining keeps every write inside one stripe
+# Capacity still limits the number of stored keys
+class ConcurrentNativeDictionary(AbstractNativeDictionary):
+    DEFAULT_CAPACITY = 21
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, stripes=LockStripes.DEFAULT_STRIPES):
+        self.__data = [None] * capacity
+        self.__capacity = capacity
+        self.__stripes = LockStripes(capacity, stripes)
+        self.__size_lock = threading.Lock()
+        self.__size = 0
+        self.__statuses = ThreadStatuses(exists=ExistsStatus.Nil, get=GetStatus.Nil, put=PutStatus.Nil)
+
+    def len(self):
+        return self.__size
+
+    def __hash_fun(self, value):
+        return sum([ord(ch) for ch in value]) % self.__capacity
+
+    def __find(self, key):
+        bucket = self.__data[self.__hash_fun(key)]
+        if bucket is None:
+            return None
+        for entry in bucket:
+            if entry[0] == key:
+                return entry
+        return None
+
+    # Reserves a slot for a new key, fails if the dictionary is full
+    def __reserve(self):
+        with self.__size_lock:
+            if self.__size == self.__capacity:
+                return False
+            self.__size += 1
+            return True
+
+    def exists(self, key):
+        if not isinstance(key, str):
+            self.__statuses.exists = ExistsStatus.BadKey
+            return False
+        self.__statuses.exists = ExistsStatus.Ok
+        return self.__find(key) is not None
+
+    def get(self, key):
+        if not isinstance(key, str):
+            self.__statuses.get = GetStatus.BadKey
+            return None
+        entry = self.__find(key)
+        if entry is None:
+            self.__statuses.get = GetStatus.NotExist
+            return None
+        self.__statuses.get = GetStatus.Ok
+        return entry[1]
+
+    def put(self, key, value):
+        if not isinstance(key, str):
+            self.__statuses.put = PutStatus.BadKey
+            return
+        index = self.__hash_fun(key)
+        with self.__stripes.lock_for(index):
+            bucket = self.__data[index] or ()
+            for i, (stored_key, _) in enumerate(bucket):
+                if stored_key == key:
+                    self.__data[index] = bucket[:i] + ((key, value),) + bucket[i + 1:]
+                    self.__statuses.put = PutStatus.Ok
+                    return
+            if not self.__reserve():
+                self.__statuses.put = PutStatus.Fail
+                return
+            self.__data[index] = bucket + ((key, value),)
+        self.__statuses.put = PutStatus.Ok
+
+    def get_exists_status(self):
+        return self.__statuses.exists
+
+    def get_get_status(self):
+        return self.__statuses.get
+
+    def get_put_status(self):
+        return self.__statuses.put
@@ -0,0 +1,175 @@
+import math
+from abc import ABC, abstractmethod
+from array import array
+from enum import Enum
+import bloom_filter as bf
+
+FIRST_ROW_MULTIPLIER = 31
+
+
+class AddStatus(Enum):
+    Nil = 0
+    Ok = 1
+    BadCount = 2
+
+
+class MergeStatus(Enum):
+    Nil = 0
+    Ok = 1
+    Incompatible = 2
+
+
+# Definition of the abstract data type
+# Approximate counts of strings in fixed memory, an estimate is never less than the real count
+class AbstractCountMinSketch(ABC):
+    # Post-condition: an empty sketch with 'depth' rows of 'width' counters is created
+    @abstractmethod
+    def __init__(self, width, depth):
+        pass
+
+    """ Commands """
+
+    # Pre-condition: n >= 0
+    # Post-condition: the count of key is increased by n
+    @abstractmethod
+    def add(self, key, n=1):
+        pass
+
+    # Pre-condition: other has the same width and depth
+    # Post-condition: counts of other are added to this sketch
+    @abstractmethod
+    def merge(self, other):
+        pass
+
+    """ Queries """
+
+    @abstractmethod
+    def estimate(self, key):
+        pass
+
+    # Return the sum of all added counts
+    @abstractmethod
+    def total(self):
+        pass
+
+    """ Status queries """
+
+    @abstractmethod
+    def get_add_status(self):
+        pass
+
+    @abstractmethod
+    def get_merge_status(self):
+        pass
+
+
+def _is_prime(n):
+    return n >= 2 and all(n % divisor for divisor in range(2, math.isqrt(n) + 1))
+
+
+# Smallest prime not less than n
+def _next_prime(n):
+    while not _is_prime(n):
+        n += 1
+    return n
+
+
+# Every row has its own polynomial hash of BloomFilter with its own prime multiplier, so keys that collide
+# in one row collide in another one independently; a lookup hashes the key depth times
+# With width = e / epsilon (rounded up to a prime) and depth = ln(1 / delta) an estimate exceeds the real count
+# by more than epsilon * total() with probability at most delta
+class CountMinSketch(AbstractCountMinSketch):
+    def __init__(self, width, depth):
+        self.width = width
+        self.depth = depth
+        self.__multipliers = []
+        multiplier = FIRST_ROW_MULTIPLIER
+        for _ in range(depth):
+            multiplier = _next_prime(multiplier)
+            self.__multipliers.append(multiplier)
+            multiplier += 1
+        self.__rows = [array('Q', bytes(width * array('Q').itemsize)) for _ in range(depth)]
+        self.__total = 0
+        self.__add_status = AddStatus.Nil
+        self.__merge_status = MergeStatus.Nil
+
+    @classmethod
+    def from_error(cls, epsilon, delta):
+        return cls(_next_prime(math.ceil(math.e / epsilon)), math.ceil(math.log(1 / delta)))
+
+    def __indexes(self, key):
+        return [bf.polynomial_hash(key, multiplier, self.width) for multiplier in self.__multipliers]
+
+    def add(self, key, n=1):
+        if n < 0:
+            self.__add_status = AddStatus.BadCount
+            return
+        self.__add_status = AddStatus.Ok
+        for row, index in zip(self.__rows, self.__indexes(key)):
+            row[index] += n
+        self.__total += n
+
+    def merge(self, other):
+        if other.width != self.width or other.depth != self.depth:
+            self.__merge_status = MergeStatus.Incompatible
+            return
+        self.__merge_status = MergeStatus.Ok
+        for row, other_row in zip(self.__rows, other.rows()):
+            for index, count in enumerate(other_row):
+                row[index] += count
+        self.__total += other.total()
+
+    # Counter rows, used to merge sketches
+    def rows(self):
+        return self.__rows
+
+    def estimate(self, key):
+        return min(row[index] for row, index in zip(self.__rows, self.__indexes(key)))
+
+    def total(self):
+        return self.__total
+
+    def get_add_status(self):
+        return self.__add_status
+
+    def get_merge_status(self):
+        return self.__merge_status
+
+
+# Tracks up to k keys with the largest estimated counts
+# A new key replaces the tracked key with the smallest estimate if its own estimate is larger
+class HeavyHitters(CountMinSketch):
+    def __init__(self, k, width, depth):
+        super().__init__(width, depth)
+        self.k = k
+        self.__top = {}
+
+    def add(self, key, n=1):
+        super().add(key, n)
+        if self.get_add_status() == AddStatus.Ok:
+            self.__track(key)
+
+    def merge(self, other):
+        super().merge(other)
+        if self.get_merge_status() != MergeStatus.Ok:
+            return
+        candidates = set(self.__top)
+        if isinstance(other, HeavyHitters):
+            candidates.update(key for key, _ in other.top())
+        self.__top = {}
+        for key in candidates:
+            self.__track(key)
+
+    def __track(self, key):
+        estimate = self.estimate(key)
+        if key in self.__top or len(self.__top) < self.k:
+            self.__top[key] = estimate
+            return
+        smallest = min(self.__top, key=self.__top.get)
+        if self.__top[smallest] < estimate:
+            del self.__top[smallest]
+            self.__top[key] = estimate
+
+    # Return (key, estimate) pairs ordered from the most frequent key
+    def top(self):
+        return sorted(self.__top.items(), key=lambda item: item[1], reverse=True)
@@ -20,7 +20,8 @@ class RemoveStatus(Enum):
     Nil = 0
     Ok = 1,
     IsNone = 2,
-    NotFound = 3
+    NotFound = 3,
+    Fail = 4  # May be used in inherited classes
 
 
 # Definition of the abstract data type
@@ -88,7 +89,7 @@ class HashTable(AbstractHashTable):
     def __hash_fun(self, value):
         return sum([ord(ch) for ch in value]) % self.capacity
 
-    def __get_index(self, value):
+    def _get_index(self, value):
         return self.__hash_fun(value) % self.capacity
 
     def seek(self, value):
@@ -98,7 +99,7 @@ class HashTable(AbstractHashTable):
         self.__seek_status = SeekStatus.Ok
         if self.__size == 0:
             return False
-        index = self.__get_index(value)
+        index = self._get_index(value)
         bucket = self.data[index]
         return bucket is not None and any(entry[0] == value for entry in bucket)
 
@@ -108,7 +109,7 @@ class HashTable(AbstractHashTable):
             return
         self._put_status = PutStatus.Ok
         self.__size += 1
-        index = self.__get_index(value)
+        index = self._get_index(value)
         bucket = self.data[index]
         if bucket is None:
             self.data[index] = [(value, 1)]
@@ -126,7 +127,7 @@ class HashTable(AbstractHashTable):
         if self.__size == 0:
             self.__remove_status = RemoveStatus.NotFound
             return
-        index = self.__get_index(value)
+        index = self._get_index(value)
         bucket = self.data[index]
         if bucket is None:
             self.__remove_status = RemoveStatus.NotFound
@@ -0,0 +1,150 @@
+import sys
+import time
+import native_dictionary as nd
+
+
+# Entry of the recency list
+class _Node:
+    __slots__ = ('key', 'value', 'size', 'expires', 'prev', 'next')
+
+    def __init__(self, key=None, value=None, size=0, expires=None):
+        self.key = key
+        self.value = value
+        self.size = size
+        self.expires = expires
+        self.prev = self
+        self.next = self
+
+
+# Cache with least recently used eviction on top of NativeDictionary
+# The dictionary maps keys to entries of an intrusive doubly linked list ordered from the most recently used,
+# so get, put and eviction are O(1)
+# Limits: number of entries, total size of values (sizeof, sys.getsizeof by default),
+# time to live of an entry (expired entries are removed when they are accessed or evicted)
+# The dictionary has twice the maximum number of entries as capacity, so a put into it always finds a free slot
+class LruCache(nd.AbstractNativeDictionary):
+    # Pre-condition: capacity > 0
+    def __init__(self, capacity, max_bytes=None, ttl=None, sizeof=sys.getsizeof, clock=time.monotonic):
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.__sizeof = sizeof
+        self.__clock = clock
+        self.__entries = nd.NativeDictionary(2 * capacity + 1)
+        self.__head = _Node()
+        self.__size = 0
+        self.__bytes = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__exists_status = nd.ExistsStatus.Nil
+        self.__get_status = nd.GetStatus.Nil
+        self.__put_status = nd.PutStatus.Nil
+
+    def len(self):
+        return self.__size
+
+    # Return the total size of values
+    def bytes(self):
+        return self.__bytes
+
+    @staticmethod
+    def __unlink(node):
+        node.prev.next = node.next
+        node.next.prev = node.prev
+
+    def __push_front(self, node):
+        node.prev = self.__head
+        node.next = self.__head.next
+        self.__head.next.prev = node
+        self.__head.next = node
+
+    def __remove(self, node):
+        self.__unlink(node)
+        self.__entries.remove(node.key)
+        self.__size -= 1
+        self.__bytes -= node.size
+
+    def __evict(self):
+        node = self.__head.prev
+        if node.expires is None or node.expires > self.__clock():
+            self.__evictions += 1
+        self.__remove(node)
+
+    # Returns the live entry of the key, removes it if it is expired
+    def __find(self, key):
+        if not self.__entries.exists(key):
+            return None
+        node = self.__entries.get(key)
+        if node.expires is not None and node.expires <= self.__clock():
+            self.__remove(node)
+            return None
+        return node
+
+    def exists(self, key):
+        if not isinstance(key, str):
+            self.__exists_status = nd.ExistsStatus.BadKey
+            return False
+        self.__exists_status = nd.ExistsStatus.Ok
+        return self.__find(key) is not None
+
+    def get(self, key):
+        if not isinstance(key, str):
+            self.__get_status = nd.GetStatus.BadKey
+            return None
+        node = self.__find(key)
+        if node is None:
+            self.__misses += 1
+            self.__get_status = nd.GetStatus.NotExist
+            return None
+        self.__hits += 1
+        self.__get_status = nd.GetStatus.Ok
+        self.__unlink(node)
+        self.__push_front(node)
+        return node.value
+
+    # ttl overrides the time to live of the cache for this entry
+    # Pre-condition: the size of value does not exceed max_bytes
+    def put(self, key, value, ttl=None):
+        if not isinstance(key, str):
+            self.__put_status = nd.PutStatus.BadKey
+            return
+        size = self.__sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.__put_status = nd.PutStatus.Fail
+            return
+        node = self.__find(key)
+        if node is not None:
+            self.__remove(node)
+        ttl = self.ttl if ttl is None else ttl
+        node = _Node(key, value, size, None if ttl is None else self.__clock() + ttl)
+        while self.__size >= self.capacity or (self.max_bytes is not None and self.__bytes + size > self.max_bytes):
+            self.__evict()
+        self.__entries.put(key, node)
+        self.__put_status = self.__entries.get_put_status()
+        if self.__put_status != nd.PutStatus.Ok:
+            return
+        self.__push_front(node)
+        self.__size += 1
+        self.__bytes += size
+
+    def get_exists_status(self):
+        return self.__exists_status
+
+    def get_get_status(self):
+        return self.__get_status
+
+    def get_put_status(self):
+        return self.__put_status
+
+    # Return the number of get calls that found a live entry
+    def get_hits(self):
+        return self.__hits
+
+    # Return the number of get calls that found no entry or an expired one
+    def get_misses(self):
+        return self.__misses
+
+    # Return the number of live entries evicted to free space
+    def get_evictions(self):
+        return self.__evictions
@@ -22,6 +22,13 @@ class PutStatus(Enum):
     Fail = 4
 
 
+class RemoveStatus(Enum):
+    Nil = 0
+    Ok = 1
+    NotExist = 2
+    BadKey = 3
+
+
 # Definition of the abstract data type
 class AbstractNativeDictionary(ABC):
     @abstractmethod
@@ -82,6 +89,7 @@ class NativeDictionary(AbstractNativeDictionary):
         self.__exists_status = ExistsStatus.Nil
         self.__get_status = GetStatus.Nil
         self.__put_status = PutStatus.Nil
+        self.__remove_status = RemoveStatus.Nil
 
     def len(self):
         return self.__size
@@ -89,22 +97,20 @@ class NativeDictionary(AbstractNativeDictionary):
     def __hash_fun(self, value):
         return sum([ord(ch) for ch in value]) % self.__capacity
 
+    # Linear probing: returns the slot of the key or the first free slot on its probe path,
+    # None if the table is full and the key is not in it
     def __seek_index(self, key):
-        key_hash = self.__hash_fun(key)
-        index = key_hash % self.__capacity
-        initial_index = index
-        stored = self.__data[index]
-        while stored is not None:
-            stored_key, _ = stored
-            if self.__hash_fun(stored_key) != key_hash:
-                break
-            if stored_key == key:
+        index = self.__hash_fun(key)
+        for _ in range(self.__capacity):
+            stored = self.__data[index]
+            if stored is None or stored[0] == key:
                 return index
             index = (index + self.STEP) % self.__capacity
-            if index == initial_index:
-                return None
-            stored = self.__data[index]
-        return index if stored is None else None
+        return None
+
+    # Number of probes from the slot of the hash to the index
+    def __distance(self, key_hash, index):
+        return (index - key_hash) * pow(self.STEP, -1, self.__capacity) % self.__capacity
 
     def exists(self, key):
         if not isinstance(key, str):
@@ -139,6 +145,34 @@ class NativeDictionary(AbstractNativeDictionary):
         self.__put_status = PutStatus.Ok
         self.__data[index] = (key, value)
 
+    # Entries following the freed slot are moved back into it if it lies on their probe path,
+    # so every key stays reachable from its hash without tombstones
+    def remove(self, key):
+        if not isinstance(key, str):
+            self.__remove_status = RemoveStatus.BadKey
+            return
+        index = self.__seek_index(key)
+        if index is None or self.__data[index] is None:
+            self.__remove_status = RemoveStatus.NotExist
+            return
+        self.__remove_status = RemoveStatus.Ok
+        self.__data[index] = None
+        hole = index
+        following = (index + self.STEP) % self.__capacity
+        while self.__data[following] is not None:
+            key_hash = self.__hash_fun(self.__data[following][0])
+            if self.__distance(key_hash, hole) < self.__distance(key_hash, following):
+                self.__data[hole] = self.__data[following]
+                self.__data[following] = None
+                hole = following
+            following = (following + self.STEP) % self.__capacity
+
+    # Iterate over stored (key, value) pairs
+    def items(self):
+        for stored in self.__data:
+            if stored is not None:
+                yield stored
+
     def get_exists_status(self):
         return self.__exists_status
 
@@ -147,3 +181,6 @@ class NativeDictionary(AbstractNativeDictionary):
 
     def get_put_status(self):
         return self.__put_status
+
+    def get_remove_status(self):
+        return self.__remove_status
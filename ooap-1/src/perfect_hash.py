@@ -0,0 +1,240 @@
+import hashlib
+import mmap
+import struct
+import sys
+from array import array
+import power_set as ps
+import snapshot as snp
+
+# Frozen table layout (little-endian):
+#   header:             magic, kind, number of keys (and slots), number of buckets, hash seed, table size
+#   displacement array: for every bucket - displacement d = d0 * slots + d1
+#   fingerprint array:  for every slot - 16 bits of the key hash, padded to 4 bytes
+#   offset array:       for every slot - offset of its record in the arena, plus the end of the arena
+#   arena:              records in slot order - varint key length, varint count or value kind, utf-8 key, value
+# Key hash h is split into bucket hash h0, slot hashes h1, h2 and fingerprint,
+# the slot of a key is (h1 + d0 * h2 + d1) % slots, where d is the displacement of its bucket
+# Overhead per key is about 9 bytes: 4 for the offset, 2 for the fingerprint, 1 for the displacement
+# (4 bytes per bucket of BUCKET_SIZE keys) and usually 2 for the varints; the value length is the distance
+# to the next record. The fingerprint rejects most missing keys without reading the arena
+MAGIC = b'OOAPMPH1'
+HEADER = struct.Struct('<8sB3xIIQQ')
+BUCKET_SIZE = 4
+MAX_SEEDS = 64
+
+
+class _BuildFailed(Exception):
+    pass
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+# Returns the value and the position after it
+def _read_varint(buffer, pos):
+    result = shift = 0
+    while True:
+        byte = buffer[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _key_hash(key, seed):
+    digest = hashlib.blake2b(key.encode(), digest_size=16, salt=struct.pack('<Q', seed)).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def _split(key_hash, buckets, slots):
+    return (key_hash & 0xffffffff) % buckets, ((key_hash >> 32) & 0xffffffff) % slots, \
+        ((key_hash >> 64) & 0xffffffff) % slots, key_hash >> 112
+
+
+# Searches displacements of buckets from the largest to the smallest (CHD algorithm)
+# Returns displacements and the slot of every key
+def _displace(hashes, buckets, slots):
+    bucket_keys = [[] for _ in range(buckets)]
+    for key_index, (bucket, _, _, _) in enumerate(hashes):
+        bucket_keys[bucket].append(key_index)
+    displacements = array('I', bytes(buckets * array('I').itemsize))
+    key_slots = [0] * len(hashes)
+    taken = bytearray(slots)
+    free_slot = 0
+    for bucket in sorted(range(buckets), key=lambda b: len(bucket_keys[b]), reverse=True):
+        keys = bucket_keys[bucket]
+        if len(keys) == 0:
+            break
+        if len(keys) == 1:
+            # A single key takes any free slot
+            while taken[free_slot]:
+                free_slot += 1
+            _, h1, _, _ = hashes[keys[0]]
+            displacements[bucket] = (free_slot - h1) % slots
+            key_slots[keys[0]] = free_slot
+            taken[free_slot] = 1
+            continue
+        displacement = _find_displacement([hashes[key][1:3] for key in keys], taken, slots)
+        displacements[bucket] = displacement
+        for key in keys:
+            _, h1, h2, _ = hashes[key]
+            key_slots[key] = (h1 + displacement // slots * h2 + displacement % slots) % slots
+            taken[key_slots[key]] = 1
+    return displacements, key_slots
+
+
+def _find_displacement(slot_hashes, taken, slots):
+    for d0 in range(min(slots, 0xffffffff // slots)):
+        positions = [(h1 + d0 * h2) % slots for h1, h2 in slot_hashes]
+        if len(set(positions)) != len(positions):
+            continue
+        for d1 in range(slots):
+            if not any(taken[(position + d1) % slots] for position in positions):
+                return d0 * slots + d1
+    raise _BuildFailed()
+
+
+# entries: (key, count or value kind, encoded value)
+def _build(kind, size, entries):
+    slots = len(entries)
+    buckets = max(1, (slots + BUCKET_SIZE - 1) // BUCKET_SIZE)
+    for seed in range(MAX_SEEDS):
+        hashes = [_split(_key_hash(key, seed), buckets, max(1, slots)) for key, _, _ in entries]
+        try:
+            displacements, key_slots = _displace(hashes, buckets, slots)
+            break
+        except _BuildFailed:
+            continue
+    else:
+        raise ValueError('Could not build a perfect hash')
+    fingerprints = array('H', bytes(slots * array('H').itemsize))
+    ordered = [None] * slots
+    for key_index, slot in enumerate(key_slots):
+        fingerprints[slot] = hashes[key_index][3]
+        ordered[slot] = entries[key_index]
+    offsets = array('I')
+    arena = bytearray()
+    for key, payload, value in ordered:
+        encoded_key = key.encode()
+        offsets.append(len(arena))
+        _write_varint(arena, len(encoded_key))
+        _write_varint(arena, payload)
+        arena += encoded_key
+        arena += value
+    offsets.append(len(arena))
+    if sys.byteorder == 'big':
+        displacements.byteswap()
+        fingerprints.byteswap()
+        offsets.byteswap()
+    return b''.join([HEADER.pack(MAGIC, kind.value, slots, buckets, seed, size), displacements.tobytes(),
+                     fingerprints.tobytes(), bytes(slots % 2 * fingerprints.itemsize),
+                     offsets.tobytes(), bytes(arena)])
+
+
+# Read-only table built on a minimal perfect hash
+# Every key has its own slot, a lookup reads one displacement, one fingerprint, two offsets and one record
+# Works over bytes in memory or over a mapped file, provides the same queries as snapshot.MappedSnapshot
+class FrozenSnapshot:
+    def __init__(self, buffer, mapped=None):
+        self.__buffer = buffer
+        self.__map = mapped
+        magic, kind, self.__slots, self.__buckets, self.__seed, self.__size = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError('Not a frozen table')
+        self.kind = snp.SnapshotKind(kind)
+        self.capacity = max(1, self.__slots)
+        self.__fingerprints_offset = HEADER.size + self.__buckets * 4
+        self.__offsets_offset = self.__fingerprints_offset + (self.__slots + self.__slots % 2) * 2
+        self.__arena_offset = self.__offsets_offset + (self.__slots + 1) * 4
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapped, mapped)
+        except ValueError:
+            mapped.close()
+            raise
+
+    def close(self):
+        if self.__map is not None:
+            self.__map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def to_bytes(self):
+        return bytes(self.__buffer)
+
+    def size(self):
+        return self.__size
+
+    def __bytes(self, offset, length):
+        start = self.__arena_offset + offset
+        return self.__buffer[start:start + length]
+
+    # Returns key offset, key length, count or value kind, value offset and length of the record in the slot
+    def __record(self, slot):
+        start, end = struct.unpack_from('<II', self.__buffer, self.__offsets_offset + slot * 4)
+        pos = self.__arena_offset + start
+        key_len, pos = _read_varint(self.__buffer, pos)
+        payload, pos = _read_varint(self.__buffer, pos)
+        key_offset = pos - self.__arena_offset
+        value_offset = key_offset + key_len
+        return key_offset, key_len, payload, value_offset, end - value_offset
+
+    def find(self, key):
+        if self.__slots == 0:
+            return None
+        bucket, h1, h2, fingerprint = _split(_key_hash(key, self.__seed), self.__buckets, self.__slots)
+        displacement, = struct.unpack_from('<I', self.__buffer, HEADER.size + bucket * 4)
+        slot = (h1 + displacement // self.__slots * h2 + displacement % self.__slots) % self.__slots
+        stored, = struct.unpack_from('<H', self.__buffer, self.__fingerprints_offset + slot * 2)
+        if stored != fingerprint:
+            return None
+        key_offset, key_len, payload, value_offset, value_len = self.__record(slot)
+        if self.__bytes(key_offset, key_len) != key.encode():
+            return None
+        return payload, value_offset, value_len
+
+    def value(self, value_kind, value_offset, value_len):
+        return snp.decode_value(value_kind, self.__bytes(value_offset, value_len))
+
+    # Iterate over (key, count or value kind, value offset, value length)
+    def entries(self):
+        for slot in range(self.__slots):
+            key_offset, key_len, payload, value_offset, value_len = self.__record(slot)
+            yield str(self.__bytes(key_offset, key_len), 'utf-8'), payload, value_offset, value_len
+
+
+# Pre-condition: table is a HashTable or a PowerSet
+# Post-condition: returns a read-only snapshot.MappedHashTable or snapshot.MappedPowerSet
+def freeze_table(table):
+    kind = snp.SnapshotKind.PowerSet if isinstance(table, ps.PowerSet) else snp.SnapshotKind.HashTable
+    entries = [entry + (b'',) for bucket in table.data if bucket is not None for entry in bucket]
+    return snp.mapped_view(FrozenSnapshot(_build(kind, table.size(), entries)))
+
+
+# Post-condition: returns a read-only snapshot.MappedNativeDictionary
+def freeze_dictionary(dictionary):
+    entries = [(key,) + snp.encode_value(value) for key, value in dictionary.items()]
+    return snp.mapped_view(FrozenSnapshot(_build(snp.SnapshotKind.NativeDictionary, len(entries), entries)))
+
+
+# Pre-condition: frozen is returned by freeze_table, freeze_dictionary or load_frozen
+def write_frozen(frozen, path):
+    with open(path, 'wb') as file:
+        file.write(frozen.snapshot.to_bytes())
+
+
+def load_frozen(path):
+    return snp.mapped_view(FrozenSnapshot.load(path))
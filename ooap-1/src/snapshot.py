@@ -0,0 +1,283 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+from enum import Enum
+import hash_table as ht
+import power_set as ps
+import native_dictionary as nd
+
+# Snapshot layout (little-endian):
+#   header:      magic, kind, capacity (hash modulus and number of slots), number of entries, table size
+#   slot array:  for every slot - index of its first entry and number of entries
+#   entry array: for every entry - key offset and length in the arena, count or value kind, value offset and length
+#   arena:       utf-8 keys and encoded values
+MAGIC = b'OOAPSNP1'
+HEADER = struct.Struct('<8sB3xIIQ')
+SLOT = struct.Struct('<II')
+ENTRY = struct.Struct('<IIIII')
+
+
+class SnapshotKind(Enum):
+    HashTable = 1
+    PowerSet = 2
+    NativeDictionary = 3
+
+
+class ValueKind(Enum):
+    String = 0
+    Json = 1
+
+
+def _hash_fun(key, capacity):
+    return sum([ord(ch) for ch in key]) % capacity
+
+
+# Values are strings or JSON: decoding a snapshot from an untrusted source never runs code
+# Pre-condition: value is a string or is JSON-serializable (tuples are restored as lists)
+def encode_value(value):
+    if isinstance(value, str):
+        return ValueKind.String.value, value.encode()
+    return ValueKind.Json.value, json.dumps(value).encode()
+
+
+def decode_value(kind, data):
+    if kind == ValueKind.String.value:
+        return str(data, 'utf-8')
+    return json.loads(str(data, 'utf-8'))
+
+
+# Iterate over unique values of a HashTable, a PowerSet or a mapped table
+def _values(table):
+    if isinstance(table, MappedHashTable):
+        return table.values()
+    return (value for bucket in table.data if bucket is not None for value, _ in bucket)
+
+
+# Writes entries grouped by slot in one sequential pass
+# entries: (key, count or value kind, encoded value)
+def _write(path, kind, capacity, size, entries):
+    slots = [[] for _ in range(capacity)]
+    for entry in entries:
+        slots[_hash_fun(entry[0], capacity)].append(entry)
+    slot_array = array('I')
+    entry_array = array('I')
+    arena = bytearray()
+    entries_count = 0
+    for slot in slots:
+        slot_array.extend((entries_count, len(slot)))
+        entries_count += len(slot)
+        for key, payload, value in slot:
+            encoded_key = key.encode()
+            entry_array.extend((len(arena), len(encoded_key), payload, len(arena) + len(encoded_key), len(value)))
+            arena += encoded_key
+            arena += value
+    if sys.byteorder == 'big':
+        slot_array.byteswap()
+        entry_array.byteswap()
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, kind.value, capacity, entries_count, size))
+        file.write(slot_array.tobytes())
+        file.write(entry_array.tobytes())
+        file.write(arena)
+
+
+# Pre-condition: table is a HashTable or a PowerSet
+def write_table_snapshot(table, path):
+    kind = SnapshotKind.PowerSet if isinstance(table, ps.PowerSet) else SnapshotKind.HashTable
+    entries = (entry + (b'',) for bucket in table.data if bucket is not None for entry in bucket)
+    _write(path, kind, table.capacity, table.size(), entries)
+
+
+def write_dictionary_snapshot(dictionary, path):
+    entries = [(key,) + encode_value(value) for key, value in dictionary.items()]
+    _write(path, SnapshotKind.NativeDictionary, max(1, len(entries)), len(entries), entries)
+
+
+# Read-only view of a snapshot file
+# Lookups are served straight from the mapped file, entries are never deserialized as a whole
+class MappedSnapshot:
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, kind, self.capacity, self.__entries_count, self.__size = HEADER.unpack_from(self.__map, 0)
+        if magic != MAGIC:
+            self.__map.close()
+            raise ValueError('Not a snapshot file')
+        self.kind = SnapshotKind(kind)
+        self.__entries_offset = HEADER.size + self.capacity * SLOT.size
+        self.__arena_offset = self.__entries_offset + self.__entries_count * ENTRY.size
+
+    def close(self):
+        self.__map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def size(self):
+        return self.__size
+
+    def __entry(self, index):
+        return ENTRY.unpack_from(self.__map, self.__entries_offset + index * ENTRY.size)
+
+    def __bytes(self, offset, length):
+        start = self.__arena_offset + offset
+        return self.__map[start:start + length]
+
+    # Returns (count or value kind, value offset, value length) of the key, None if not found
+    def find(self, key):
+        encoded_key = key.encode()
+        first, count = SLOT.unpack_from(self.__map, HEADER.size + _hash_fun(key, self.capacity) * SLOT.size)
+        for index in range(first, first + count):
+            key_offset, key_len, payload, value_offset, value_len = self.__entry(index)
+            if key_len == len(encoded_key) and self.__bytes(key_offset, key_len) == encoded_key:
+                return payload, value_offset, value_len
+        return None
+
+    def value(self, value_kind, value_offset, value_len):
+        return decode_value(value_kind, self.__bytes(value_offset, value_len))
+
+    # Iterate over (key, count or value kind, value offset, value length)
+    def entries(self):
+        for index in range(self.__entries_count):
+            key_offset, key_len, payload, value_offset, value_len = self.__entry(index)
+            yield str(self.__bytes(key_offset, key_len), 'utf-8'), payload, value_offset, value_len
+
+
+# Read-only hash table backed by a snapshot, put and remove always fail
+class MappedHashTable(ht.AbstractHashTable):
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.capacity = snapshot.capacity
+        self.__seek_status = ht.SeekStatus.Nil
+        self.__put_status = ht.PutStatus.Nil
+        self.__remove_status = ht.RemoveStatus.Nil
+
+    def size(self):
+        return self.snapshot.size()
+
+    def values(self):
+        for key, _, _, _ in self.snapshot.entries():
+            yield key
+
+    def seek(self, value):
+        if value is None:
+            self.__seek_status = ht.SeekStatus.IsNone
+            return False
+        self.__seek_status = ht.SeekStatus.Ok
+        return self.snapshot.find(value) is not None
+
+    # Return the number of copies of value
+    def count(self, value):
+        found = None if value is None else self.snapshot.find(value)
+        return 0 if found is None else found[0]
+
+    def put(self, value):
+        self.__put_status = ht.PutStatus.IsNone if value is None else ht.PutStatus.Fail
+
+    def remove(self, value):
+        self.__remove_status = ht.RemoveStatus.IsNone if value is None else ht.RemoveStatus.Fail
+
+    def get_seek_status(self):
+        return self.__seek_status
+
+    def get_put_status(self):
+        return self.__put_status
+
+    def get_remove_status(self):
+        return self.__remove_status
+
+
+# Read-only set backed by a snapshot, results of set operations are regular PowerSets
+class MappedPowerSet(MappedHashTable, ps.AbstractPowerSet):
+    def __init__(self, snapshot):
+        super().__init__(snapshot)
+
+    def intersection(self, other):
+        result = ps.PowerSet(min(self.capacity, other.capacity))
+        for value in self.values():
+            if other.seek(value):
+                result.put(value)
+        return result
+
+    def union(self, other):
+        result = ps.PowerSet(self.capacity + other.capacity)
+        for value in self.values():
+            result.put(value)
+        for value in _values(other):
+            result.put(value)
+        return result
+
+    def difference(self, other):
+        result = ps.PowerSet(max(self.capacity, other.capacity))
+        for value in self.values():
+            if not other.seek(value):
+                result.put(value)
+        return result
+
+    def is_subset(self, other):
+        for value in _values(other):
+            if not self.seek(value):
+                return False
+        return True
+
+
+# Read-only dictionary backed by a snapshot, values are decoded on every get
+class MappedNativeDictionary(nd.AbstractNativeDictionary):
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.__exists_status = nd.ExistsStatus.Nil
+        self.__get_status = nd.GetStatus.Nil
+        self.__put_status = nd.PutStatus.Nil
+
+    def len(self):
+        return self.snapshot.size()
+
+    def exists(self, key):
+        if not isinstance(key, str):
+            self.__exists_status = nd.ExistsStatus.BadKey
+            return False
+        self.__exists_status = nd.ExistsStatus.Ok
+        return self.snapshot.find(key) is not None
+
+    def get(self, key):
+        if not isinstance(key, str):
+            self.__get_status = nd.GetStatus.BadKey
+            return None
+        found = self.snapshot.find(key)
+        if found is None:
+            self.__get_status = nd.GetStatus.NotExist
+            return None
+        self.__get_status = nd.GetStatus.Ok
+        return self.snapshot.value(*found)
+
+    def put(self, key, value):
+        self.__put_status = nd.PutStatus.BadKey if not isinstance(key, str) else nd.PutStatus.Fail
+
+    def get_exists_status(self):
+        return self.__exists_status
+
+    def get_get_status(self):
+        return self.__get_status
+
+    def get_put_status(self):
+        return self.__put_status
+
+
+# Wraps a snapshot reader into the read-only type it was written from
+# Pre-condition: snapshot provides kind, capacity, size, find, value and entries like MappedSnapshot
+def mapped_view(snapshot):
+    if snapshot.kind == SnapshotKind.PowerSet:
+        return MappedPowerSet(snapshot)
+    if snapshot.kind == SnapshotKind.NativeDictionary:
+        return MappedNativeDictionary(snapshot)
+    return MappedHashTable(snapshot)
+
+
+# Maps a snapshot file and wraps it into the read-only type it was written from
+def load_snapshot(path):
+    return mapped_view(MappedSnapshot(path))
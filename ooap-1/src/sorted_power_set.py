@@ -0,0 +1,268 @@
+from abc import abstractmethod
+from bisect import bisect_left, insort
+from enum import Enum
+import hash_table as ht
+import power_set as ps
+
+
+class BoundStatus(Enum):
+    Nil = 0
+    Ok = 1
+    Empty = 2
+
+
+# Definition of the abstract data type
+# Values are kept in ascending order, values must be mutually comparable
+class AbstractSortedPowerSet(ps.AbstractPowerSet):
+    """ Queries """
+
+    # Pre-condition: the set is not empty
+    @abstractmethod
+    def min(self):
+        pass
+
+    # Pre-condition: the set is not empty
+    @abstractmethod
+    def max(self):
+        pass
+
+    # Iterate in ascending order over values v such that lo <= v < hi
+    @abstractmethod
+    def range(self, lo, hi):
+        pass
+
+    # Return the number of values less than value
+    @abstractmethod
+    def rank(self, value):
+        pass
+
+    """ Status queries """
+
+    @abstractmethod
+    def get_min_status(self):
+        pass
+
+    @abstractmethod
+    def get_max_status(self):
+        pass
+
+
+# Sorted set stored as a list of sorted blocks (a two-level B-tree)
+# Block maximums are kept in a separate list to find the block by binary search
+# Block sizes are summed in a Fenwick tree, so rank does not walk over preceding blocks
+# Set algebra with another SortedPowerSet is a linear merge of two sorted sequences without hashing
+class SortedPowerSet(AbstractSortedPowerSet):
+    BLOCK_SIZE = 512
+
+    # Capacity is accepted for compatibility with PowerSet, the set grows as needed
+    def __init__(self, capacity=ht.HashTable.DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.__blocks = []
+        self.__maxes = []
+        self.__sizes = [0]
+        self.__size = 0
+        self.__seek_status = ht.SeekStatus.Nil
+        self.__put_status = ht.PutStatus.Nil
+        self.__remove_status = ht.RemoveStatus.Nil
+        self.__min_status = BoundStatus.Nil
+        self.__max_status = BoundStatus.Nil
+
+    @classmethod
+    def from_sorted(cls, values, capacity=ht.HashTable.DEFAULT_CAPACITY):
+        result = cls(capacity)
+        result.__blocks = [values[i:i + cls.BLOCK_SIZE] for i in range(0, len(values), cls.BLOCK_SIZE)]
+        result.__maxes = [block[-1] for block in result.__blocks]
+        result.__size = len(values)
+        result.__build_sizes()
+        return result
+
+    # Fenwick tree over block sizes, rebuilt when blocks are added or removed
+    def __build_sizes(self):
+        self.__sizes = [0] * (len(self.__blocks) + 1)
+        for i, block in enumerate(self.__blocks, 1):
+            self.__sizes[i] += len(block)
+            parent = i + (i & -i)
+            if parent < len(self.__sizes):
+                self.__sizes[parent] += self.__sizes[i]
+
+    def __add_size(self, block_index, delta):
+        i = block_index + 1
+        while i < len(self.__sizes):
+            self.__sizes[i] += delta
+            i += i & -i
+
+    # Return the number of values in blocks before block_index
+    def __values_before(self, block_index):
+        result = 0
+        i = block_index
+        while i > 0:
+            result += self.__sizes[i]
+            i -= i & -i
+        return result
+
+    def __iter__(self):
+        for block in self.__blocks:
+            yield from block
+
+    def size(self):
+        return self.__size
+
+    def __find(self, value):
+        block_index = bisect_left(self.__maxes, value)
+        if block_index == len(self.__blocks):
+            return block_index, None
+        block = self.__blocks[block_index]
+        index = bisect_left(block, value)
+        return block_index, index if block[index] == value else None
+
+    def seek(self, value):
+        if value is None:
+            self.__seek_status = ht.SeekStatus.IsNone
+            return False
+        self.__seek_status = ht.SeekStatus.Ok
+        _, index = self.__find(value)
+        return index is not None
+
+    def put(self, value):
+        if value is None:
+            self.__put_status = ht.PutStatus.IsNone
+            return
+        block_index, index = self.__find(value)
+        if index is not None:
+            self.__put_status = ht.PutStatus.Exists
+            return
+        self.__put_status = ht.PutStatus.Ok
+        self.__size += 1
+        if len(self.__blocks) == 0:
+            self.__blocks.append([value])
+            self.__maxes.append(value)
+            self.__build_sizes()
+            return
+        if block_index == len(self.__blocks):
+            block_index -= 1
+        block = self.__blocks[block_index]
+        insort(block, value)
+        self.__maxes[block_index] = block[-1]
+        if len(block) > 2 * self.BLOCK_SIZE:
+            self.__blocks[block_index:block_index + 1] = [block[:self.BLOCK_SIZE], block[self.BLOCK_SIZE:]]
+            self.__maxes.insert(block_index, block[self.BLOCK_SIZE - 1])
+            self.__build_sizes()
+            return
+        self.__add_size(block_index, 1)
+
+    def remove(self, value):
+        if value is None:
+            self.__remove_status = ht.RemoveStatus.IsNone
+            return
+        block_index, index = self.__find(value)
+        if index is None:
+            self.__remove_status = ht.RemoveStatus.NotFound
+            return
+        self.__remove_status = ht.RemoveStatus.Ok
+        self.__size -= 1
+        block = self.__blocks[block_index]
+        block.pop(index)
+        if len(block) == 0:
+            self.__blocks.pop(block_index)
+            self.__maxes.pop(block_index)
+            self.__build_sizes()
+            return
+        self.__maxes[block_index] = block[-1]
+        self.__add_size(block_index, -1)
+
+    def min(self):
+        if self.__size == 0:
+            self.__min_status = BoundStatus.Empty
+            return None
+        self.__min_status = BoundStatus.Ok
+        return self.__blocks[0][0]
+
+    def max(self):
+        if self.__size == 0:
+            self.__max_status = BoundStatus.Empty
+            return None
+        self.__max_status = BoundStatus.Ok
+        return self.__maxes[-1]
+
+    def range(self, lo, hi):
+        block_index = bisect_left(self.__maxes, lo)
+        index = bisect_left(self.__blocks[block_index], lo) if block_index < len(self.__blocks) else 0
+        for block in self.__blocks[block_index:]:
+            for value in block[index:]:
+                if value >= hi:
+                    return
+                yield value
+            index = 0
+
+    def rank(self, value):
+        block_index = bisect_left(self.__maxes, value)
+        result = self.__values_before(block_index)
+        if block_index < len(self.__blocks):
+            result += bisect_left(self.__blocks[block_index], value)
+        return result
+
+    # Merges two sorted sequences, keeping values selected by the flags:
+    # only in self, only in other, in both
+    def __merge(self, other, keep_self, keep_other, keep_both):
+        result = []
+        self_values = iter(self)
+        other_values = iter(other)
+        a = next(self_values, None)
+        b = next(other_values, None)
+        while a is not None and b is not None:
+            if a < b:
+                if keep_self:
+                    result.append(a)
+                a = next(self_values, None)
+            elif b < a:
+                if keep_other:
+                    result.append(b)
+                b = next(other_values, None)
+            else:
+                if keep_both:
+                    result.append(a)
+                a = next(self_values, None)
+                b = next(other_values, None)
+        if keep_self and a is not None:
+            result.append(a)
+            result.extend(self_values)
+        if keep_other and b is not None:
+            result.append(b)
+            result.extend(other_values)
+        return result
+
+    # Pre-condition: other is a SortedPowerSet or a PowerSet
+    def __sorted_values(self, other):
+        if isinstance(other, SortedPowerSet):
+            return other
+        return sorted(value for bucket in other.data if bucket is not None for value, _ in bucket)
+
+    def intersection(self, other):
+        values = self.__merge(self.__sorted_values(other), False, False, True)
+        return SortedPowerSet.from_sorted(values, min(self.capacity, other.capacity))
+
+    def union(self, other):
+        values = self.__merge(self.__sorted_values(other), True, True, True)
+        return SortedPowerSet.from_sorted(values, self.capacity + other.capacity)
+
+    def difference(self, other):
+        values = self.__merge(self.__sorted_values(other), True, False, False)
+        return SortedPowerSet.from_sorted(values, max(self.capacity, other.capacity))
+
+    def is_subset(self, other):
+        return len(self.__merge(self.__sorted_values(other), False, True, False)) == 0
+
+    def get_seek_status(self):
+        return self.__seek_status
+
+    def get_put_status(self):
+        return self.__put_status
+
+    def get_remove_status(self):
+        return self.__remove_status
+
+    def get_min_status(self):
+        return self.__min_status
+
+    def get_max_status(self):
+        return self.__max_status
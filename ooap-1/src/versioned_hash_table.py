@@ -0,0 +1,134 @@
+import weakref
+import hash_table as ht
+import power_set as ps
+
+_NOT_SAVED = object()
+
+
+# Buckets of the live table as they were when a group of snapshots was taken
+# Only buckets changed after that moment are stored
+class _Version:
+    def __init__(self):
+        self.saved = {}
+
+
+# Read-only view of a table at the moment of snapshot()
+# Shares buckets with the live table, put and remove always fail
+class TableSnapshot(ht.AbstractHashTable):
+    def __init__(self, table, version, size):
+        self.capacity = table.capacity
+        self.__live_data = table.data
+        self.__version = version
+        self.__size = size
+        self.__seek_status = ht.SeekStatus.Nil
+        self.__put_status = ht.PutStatus.Nil
+        self.__remove_status = ht.RemoveStatus.Nil
+
+    # Live bucket is read before the saved one: the writer saves the original bucket
+    # before publishing its copy, so any interleaving yields the bucket of this version
+    def _bucket(self, index):
+        bucket = self.__live_data[index]
+        saved = self.__version.saved.get(index, _NOT_SAVED)
+        return bucket if saved is _NOT_SAVED else saved
+
+    # Buckets of this version, in the same layout as HashTable.data
+    @property
+    def data(self):
+        return [self._bucket(index) for index in range(self.capacity)]
+
+    def size(self):
+        return self.__size
+
+    def seek(self, value):
+        if value is None:
+            self.__seek_status = ht.SeekStatus.IsNone
+            return False
+        self.__seek_status = ht.SeekStatus.Ok
+        bucket = self._bucket(sum([ord(ch) for ch in value]) % self.capacity)
+        return bucket is not None and any(entry[0] == value for entry in bucket)
+
+    def put(self, value):
+        self.__put_status = ht.PutStatus.IsNone if value is None else ht.PutStatus.Fail
+
+    def remove(self, value):
+        self.__remove_status = ht.RemoveStatus.IsNone if value is None else ht.RemoveStatus.Fail
+
+    def get_seek_status(self):
+        return self.__seek_status
+
+    def get_put_status(self):
+        return self.__put_status
+
+    def get_remove_status(self):
+        return self.__remove_status
+
+
+class PowerSetSnapshot(TableSnapshot, ps.AbstractPowerSet):
+    def __init__(self, table, version, size):
+        super().__init__(table, version, size)
+
+    def intersection(self, other):
+        return ps.PowerSet.intersection(self, other)
+
+    def add_all_to(self, other):
+        ps.PowerSet.add_all_to(self, other)
+
+    def union(self, other):
+        return ps.PowerSet.union(self, other)
+
+    def difference(self, other):
+        return ps.PowerSet.difference(self, other)
+
+    def is_subset(self, other):
+        return ps.PowerSet.is_subset(self, other)
+
+
+# Hash table with cheap copy-on-write snapshots
+# After a snapshot, the writer copies a bucket the first time it touches it
+# and leaves the original to the snapshots, so memory grows with the number of changed buckets
+# Pre-condition for concurrent use: one writer, snapshot() is called by the writer
+class VersionedHashTable(ht.HashTable):
+    SNAPSHOT_TYPE = TableSnapshot
+
+    def __init__(self, capacity=ht.HashTable.DEFAULT_CAPACITY):
+        super().__init__(capacity)
+        self.__versions = []
+        self.__current = None
+
+    def snapshot(self):
+        version = None if self.__current is None else self.__current()
+        if version is None:
+            version = _Version()
+            self.__current = weakref.ref(version)
+            self.__versions.append(self.__current)
+        return self.SNAPSHOT_TYPE(self, version, self.size())
+
+    def __detach(self, value):
+        if value is None:
+            return
+        self.__current = None
+        index = self._get_index(value)
+        versions = [version for version in (ref() for ref in self.__versions) if version is not None]
+        self.__versions = [weakref.ref(version) for version in versions]
+        waiting = [version for version in versions if index not in version.saved]
+        if len(waiting) == 0:
+            return
+        bucket = self.data[index]
+        for version in waiting:
+            version.saved[index] = bucket
+        self.data[index] = None if bucket is None else list(bucket)
+
+    def put(self, value):
+        self.__detach(value)
+        super().put(value)
+
+    def remove(self, value):
+        self.__detach(value)
+        super().remove(value)
+
+
+class VersionedPowerSet(ps.PowerSet, VersionedHashTable):
+    SNAPSHOT_TYPE = PowerSetSnapshot
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
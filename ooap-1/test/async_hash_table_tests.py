@@ -0,0 +1,65 @@
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from async_hash_table import *
+
+
+class TestAsyncPowerSet(unittest.TestCase):
+    def setUp(self):
+        self.strings = ['str' + str(i) for i in range(1500)]
+
+    def make_sets(self):
+        p_set1 = AsyncPowerSet(30, yield_every=100)
+        p_set2 = AsyncPowerSet(30, yield_every=100)
+        asyncio.run(p_set1.put_many(self.strings[:1000]))
+        asyncio.run(p_set2.put_many(self.strings[500:]))
+        return p_set1, p_set2
+
+    def test_set_algebra(self):
+        p_set1, p_set2 = self.make_sets()
+        self.assertEqual(asyncio.run(p_set1.union_async(p_set2)).size(), 1500)
+        self.assertEqual(asyncio.run(p_set1.intersection_async(p_set2)).size(), 500)
+        self.assertEqual(asyncio.run(p_set1.difference_async(p_set2)).size(), 500)
+        self.assertFalse(asyncio.run(p_set1.is_subset_async(p_set2)))
+        self.assertTrue(asyncio.run(p_set1.is_subset_async(asyncio.run(p_set1.intersection_async(p_set2)))))
+
+    def test_executor(self):
+        p_set1, p_set2 = self.make_sets()
+        with ThreadPoolExecutor(1) as executor:
+            self.assertEqual(asyncio.run(p_set1.union_async(p_set2, executor)).size(), 1500)
+            self.assertEqual(asyncio.run(p_set1.difference_async(p_set2, executor)).size(), 500)
+
+    def test_loop_is_not_blocked(self):
+        p_set = AsyncPowerSet(30, yield_every=10)
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(p_set.size())
+                await asyncio.sleep(0)
+
+        async def fill():
+            task = asyncio.create_task(ticker())
+            await p_set.put_many(self.strings)
+            task.cancel()
+            return [entry async for entry in p_set.entries()]
+
+        entries = asyncio.run(fill())
+        self.assertEqual(len(entries), len(self.strings))
+        self.assertGreater(len(ticks), 100)
+
+
+class TestAsyncNativeDictionary(unittest.TestCase):
+    def test_entries(self):
+        dictionary = AsyncNativeDictionary(30, yield_every=2)
+        items = [('key', 'value'), ('ключ', [1, 2, 3]), ('other', 0)]
+
+        async def fill():
+            await dictionary.put_many(items)
+            return [(key, value) async for key, value in dictionary.entries()]
+
+        self.assertEqual(sorted(asyncio.run(fill()), key=str), sorted(items, key=str))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import threading
+import unittest
+import hash_table as ht
+import native_dictionary as nd
+from concurrent_hash_table import ConcurrentHashTable
+from concurrent_native_dictionary import ConcurrentNativeDictionary
+
+
+# Exceptions in threads do not fail a test, so every target returns (actual, expected) pairs
+# that are checked in the main thread; a thread that raised leaves None instead of its pairs
+def run_in_threads(test, target, threads_count):
+    results = [None] * threads_count
+
+    def run(thread_index):
+        results[thread_index] = target(thread_index)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    test.assertNotIn(None, results)
+    for result in results:
+        for actual, expected in result:
+            test.assertEqual(actual, expected)
+
+
+class TestConcurrentHashTable(unittest.TestCase):
+    def test_parallel_put_remove(self):
+        table = ConcurrentHashTable(30, 4)
+        strings = ['abc', 'afqewf', 'adsggqw', 'wghweghehw', 'qwgqewgqgqe']
+
+        def worker(_):
+            observed = []
+            for _ in range(200):
+                for string in strings:
+                    table.put(string)
+                    observed.append((table.get_put_status(), ht.PutStatus.Ok))
+                    observed.append((table.seek(string), True))
+            for _ in range(100):
+                for string in strings:
+                    table.remove(string)
+                    observed.append((table.get_remove_status(), ht.RemoveStatus.Ok))
+            return observed
+
+        run_in_threads(self, worker, 8)
+        self.assertEqual(table.size(), 8 * 100 * len(strings))
+        real_size = sum(count for bucket in table.data if bucket is not None for _, count in bucket)
+        self.assertEqual(real_size, table.size())
+
+    def test_statuses_per_thread(self):
+        table = ConcurrentHashTable()
+        table.seek('abc')
+        other_status = []
+        thread = threading.Thread(target=lambda: other_status.append((table.seek(None), table.get_seek_status())))
+        thread.start()
+        thread.join()
+        self.assertEqual(other_status, [(False, ht.SeekStatus.IsNone)])
+        self.assertEqual(table.get_seek_status(), ht.SeekStatus.Ok)
+        table.remove('abc')
+        self.assertEqual(table.get_remove_status(), ht.RemoveStatus.NotFound)
+
+
+class TestConcurrentNativeDictionary(unittest.TestCase):
+    def test_parallel_put_get(self):
+        dictionary = ConcurrentNativeDictionary(100, 4)
+
+        def worker(thread_index):
+            observed = []
+            for i in range(10):
+                key = 'key' + str(thread_index * 10 + i)
+                dictionary.put(key, i)
+                observed.append((dictionary.get_put_status(), nd.PutStatus.Ok))
+                observed.append((dictionary.get(key), i))
+                observed.append((dictionary.get_get_status(), nd.GetStatus.Ok))
+            return observed
+
+        run_in_threads(self, worker, 10)
+        self.assertEqual(dictionary.len(), 100)
+        dictionary.put('overflow', 0)
+        self.assertEqual(dictionary.get_put_status(), nd.PutStatus.Fail)
+        dictionary.put('key0', 'replaced')
+        self.assertEqual(dictionary.get_put_status(), nd.PutStatus.Ok)
+        self.assertEqual(dictionary.get('key0'), 'replaced')
+        self.assertFalse(dictionary.exists('missing'))
+        self.assertEqual(dictionary.get_exists_status(), nd.ExistsStatus.Ok)
+        dictionary.get('missing')
+        self.assertEqual(dictionary.get_get_status(), nd.GetStatus.NotExist)
+
+
+if __name__ == '__main__':
+    unittest.main()
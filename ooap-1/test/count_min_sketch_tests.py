@@ -0,0 +1,72 @@
+import unittest
+import random
+import string
+from count_min_sketch import *
+
+
+def generate_random_string():
+    return ''.join(random.choices(string.ascii_letters + string.digits, k=25))
+
+
+class TestCountMinSketch(unittest.TestCase):
+    def test_estimate(self):
+        sketch = CountMinSketch.from_error(0.001, 0.01)
+        strings = [generate_random_string() for _ in range(1000)]
+        for i, key in enumerate(strings):
+            sketch.add(key, i % 10 + 1)
+            self.assertEqual(sketch.get_add_status(), AddStatus.Ok)
+        self.assertEqual(sketch.total(), sum(i % 10 + 1 for i in range(1000)))
+        for i, key in enumerate(strings):
+            self.assertGreaterEqual(sketch.estimate(key), i % 10 + 1)
+            self.assertLessEqual(sketch.estimate(key), i % 10 + 1 + 0.001 * sketch.total() * 2)
+        sketch.add('abc', -1)
+        self.assertEqual(sketch.get_add_status(), AddStatus.BadCount)
+
+    def test_merge(self):
+        sketch1 = CountMinSketch(100, 4)
+        sketch2 = CountMinSketch(100, 4)
+        sketch1.add('abc', 3)
+        sketch2.add('abc', 4)
+        sketch2.add('cba')
+        sketch1.merge(sketch2)
+        self.assertEqual(sketch1.get_merge_status(), MergeStatus.Ok)
+        self.assertGreaterEqual(sketch1.estimate('abc'), 7)
+        self.assertGreaterEqual(sketch1.estimate('cba'), 1)
+        self.assertEqual(sketch1.total(), 8)
+        sketch1.merge(CountMinSketch(50, 4))
+        self.assertEqual(sketch1.get_merge_status(), MergeStatus.Incompatible)
+        self.assertEqual(sketch1.total(), 8)
+
+    def test_rows_are_independent(self):
+        self.assertEqual(CountMinSketch.from_error(0.01, 0.001).width, 277)
+        # 272 = 16 * 17: keys that collide in the first two rows should not collide in all rows
+        generator = random.Random(5)
+        by_first_rows = {}
+        for _ in range(2000):
+            sketch = CountMinSketch(272, 5)
+            sketch.add(''.join(generator.choices(string.ascii_letters + string.digits, k=25)))
+            columns = tuple(row.index(1) for row in sketch.rows())
+            by_first_rows.setdefault(columns[:2], []).append(columns)
+        colliding = [group for group in by_first_rows.values() if len(group) > 1]
+        self.assertGreater(len(colliding), 0)
+        for group in colliding:
+            self.assertEqual(len(set(group)), len(group))
+        sketch = CountMinSketch(1, 3)
+        sketch.add('abc', 2)
+        self.assertEqual(sketch.estimate('cba'), 2)
+
+    def test_heavy_hitters(self):
+        hitters = HeavyHitters(3, 1000, 5)
+        for key, count in [('abc', 100), ('afqewf', 50), ('adsggqw', 30)]:
+            hitters.add(key, count)
+        for _ in range(200):
+            hitters.add(generate_random_string())
+        self.assertEqual([key for key, _ in hitters.top()], ['abc', 'afqewf', 'adsggqw'])
+        other = HeavyHitters(3, 1000, 5)
+        other.add('wghweghehw', 500)
+        hitters.merge(other)
+        self.assertEqual([key for key, _ in hitters.top()], ['wghweghehw', 'abc', 'afqewf'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from power_set import PowerSet
+from hyper_log_log import *
+
+
+class TestHyperLogLog(unittest.TestCase):
+    def assertClose(self, estimate, count, error):
+        self.assertLessEqual(abs(estimate - count), count * error)
+
+    def test_estimate(self):
+        counter = HyperLogLog()
+        for i in range(100):
+            counter.add('str' + str(i))
+            counter.add('str' + str(i))
+        self.assertEqual(counter.get_add_status(), AddStatus.Ok)
+        self.assertTrue(counter.is_sparse())
+        self.assertClose(counter.estimate(), 100, 0.02)
+        dense_bytes = counter.m * REGISTER_BITS // 8 + 1
+        for i in range(100, 50000):
+            counter.add('str' + str(i))
+            if counter.is_sparse():
+                self.assertLessEqual(counter.register_bytes(), dense_bytes)
+        self.assertFalse(counter.is_sparse())
+        self.assertEqual(counter.register_bytes(), dense_bytes)
+        self.assertClose(counter.estimate(), 50000, 0.03)
+        counter.add(None)
+        self.assertEqual(counter.get_add_status(), AddStatus.IsNone)
+
+    def test_merge(self):
+        counter1 = HyperLogLog()
+        counter2 = HyperLogLog()
+        for i in range(20000):
+            counter1.add('str' + str(i))
+        for i in range(10000, 30000):
+            counter2.add('str' + str(i))
+        sparse = HyperLogLog()
+        sparse.add('other')
+        counter1.merge(counter2)
+        counter1.merge(sparse)
+        self.assertEqual(counter1.get_merge_status(), MergeStatus.Ok)
+        self.assertClose(counter1.estimate(), 30001, 0.03)
+        counter1.merge(HyperLogLog(10))
+        self.assertEqual(counter1.get_merge_status(), MergeStatus.Incompatible)
+
+    def test_from_table(self):
+        p_set = PowerSet(30)
+        for i in range(1000):
+            p_set.put('str' + str(i))
+        counter = HyperLogLog.from_table(p_set)
+        self.assertClose(counter.estimate(), p_set.size(), 0.03)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import native_dictionary as nd
+from lru_cache import *
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestNativeDictionaryRemove(unittest.TestCase):
+    def test(self):
+        dictionary = nd.NativeDictionary(30)
+        for key in ['ab', 'ba', 'abc', 'cba', 'bca']:
+            dictionary.put(key, key + '!')
+        dictionary.remove('ab')
+        self.assertEqual(dictionary.get_remove_status(), nd.RemoveStatus.Ok)
+        self.assertFalse(dictionary.exists('ab'))
+        self.assertEqual(dictionary.get('ba'), 'ba!')
+        dictionary.remove('abc')
+        self.assertEqual(dictionary.get('cba'), 'cba!')
+        self.assertEqual(dictionary.get('bca'), 'bca!')
+        self.assertEqual(sorted(key for key, _ in dictionary.items()), ['ba', 'bca', 'cba'])
+        dictionary.remove('abc')
+        self.assertEqual(dictionary.get_remove_status(), nd.RemoveStatus.NotExist)
+        dictionary.remove(1)
+        self.assertEqual(dictionary.get_remove_status(), nd.RemoveStatus.BadKey)
+
+    def test_different_hashes(self):
+        dictionary = nd.NativeDictionary(30)
+        for key in ['ab', 'ba', 'ac', 'ad']:
+            dictionary.put(key, key + '!')
+            self.assertEqual(dictionary.get_put_status(), nd.PutStatus.Ok)
+        dictionary.remove('ab')
+        for key in ['ba', 'ac', 'ad']:
+            self.assertTrue(dictionary.exists(key))
+            self.assertEqual(dictionary.get(key), key + '!')
+        self.assertFalse(dictionary.exists('ab'))
+
+
+class TestLruCache(unittest.TestCase):
+    def test_lru(self):
+        cache = LruCache(3)
+        for i in range(3):
+            cache.put('key' + str(i), i)
+            self.assertEqual(cache.get_put_status(), nd.PutStatus.Ok)
+        self.assertEqual(cache.get('key0'), 0)
+        cache.put('key3', 3)
+        self.assertEqual(cache.len(), 3)
+        self.assertFalse(cache.exists('key1'))
+        self.assertIsNone(cache.get('key1'))
+        self.assertEqual(cache.get_get_status(), nd.GetStatus.NotExist)
+        self.assertEqual(cache.get('key0'), 0)
+        self.assertEqual(cache.get_get_status(), nd.GetStatus.Ok)
+        cache.put('key2', 'new')
+        self.assertEqual(cache.len(), 3)
+        self.assertEqual(cache.get('key2'), 'new')
+        self.assertEqual(cache.get_hits(), 3)
+        self.assertEqual(cache.get_misses(), 1)
+        self.assertEqual(cache.get_evictions(), 1)
+        cache.put(1, 1)
+        self.assertEqual(cache.get_put_status(), nd.PutStatus.BadKey)
+
+    def test_max_bytes(self):
+        cache = LruCache(100, max_bytes=10, sizeof=len)
+        cache.put('a', 'aaaa')
+        cache.put('b', 'bbbb')
+        cache.put('c', 'cccc')
+        self.assertEqual(cache.bytes(), 8)
+        self.assertFalse(cache.exists('a'))
+        cache.put('d', 'd' * 11)
+        self.assertEqual(cache.get_put_status(), nd.PutStatus.Fail)
+        self.assertEqual(cache.len(), 2)
+
+    def test_ttl(self):
+        clock = Clock()
+        cache = LruCache(10, ttl=5, clock=clock)
+        cache.put('a', 1)
+        cache.put('b', 2, ttl=20)
+        clock.now = 10
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 2)
+        self.assertEqual(cache.len(), 1)
+        self.assertEqual(cache.get_evictions(), 0)
+
+    def test_many(self):
+        cache = LruCache(50)
+        for i in range(1000):
+            cache.put('str' + str(i), i)
+            self.assertEqual(cache.get_put_status(), nd.PutStatus.Ok)
+            self.assertEqual(cache.get('str' + str(i)), i)
+        self.assertEqual(cache.len(), 50)
+        self.assertEqual(cache.get_evictions(), 950)
+        self.assertEqual(cache.len(), sum(1 for i in range(1000) if cache.exists('str' + str(i))))
+
+
+if __name__ == '__main__':
+    unittest.main()
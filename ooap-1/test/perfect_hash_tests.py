@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+import hash_table as ht
+import native_dictionary as nd
+from power_set import PowerSet
+from snapshot import MappedHashTable, MappedPowerSet, MappedNativeDictionary
+from perfect_hash import *
+
+
+class TestPerfectHash(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_hash_table(self):
+        table = ht.HashTable(30)
+        for string in ['abc', 'afqewf', 'adsggqw', 'wghweghehw', 'qwgqewgqgqe', 'abc', 'abc', 'cba']:
+            table.put(string)
+        frozen = freeze_table(table)
+        self.assertIsInstance(frozen, MappedHashTable)
+        self.assertEqual(frozen.size(), table.size())
+        for string in ['abc', 'afqewf', 'adsggqw', 'wghweghehw', 'qwgqewgqgqe', 'cba']:
+            self.assertTrue(frozen.seek(string))
+            self.assertEqual(frozen.get_seek_status(), ht.SeekStatus.Ok)
+        self.assertEqual(frozen.count('abc'), 3)
+        self.assertFalse(frozen.seek('bac'))
+        frozen.put('bac')
+        self.assertEqual(frozen.get_put_status(), ht.PutStatus.Fail)
+
+    def test_power_set(self):
+        p_set1 = PowerSet(30)
+        p_set2 = PowerSet(30)
+        for i in range(1000):
+            p_set1.put('str' + str(i))
+        for i in range(500, 1500):
+            p_set2.put('str' + str(i))
+        frozen = freeze_table(p_set1)
+        self.assertIsInstance(frozen, MappedPowerSet)
+        self.assertEqual(frozen.capacity, 1000)
+        self.assertEqual(sorted(frozen.values()), sorted('str' + str(i) for i in range(1000)))
+        for i in range(1500):
+            self.assertEqual(frozen.seek('str' + str(i)), i < 1000)
+        self.assertEqual(frozen.union(p_set2).size(), 1500)
+        self.assertEqual(frozen.intersection(p_set2).size(), 500)
+        self.assertEqual(frozen.difference(p_set2).size(), 500)
+        key_bytes = sum(len('str' + str(i)) for i in range(1000))
+        self.assertLessEqual(len(frozen.snapshot.to_bytes()), HEADER.size + key_bytes + 10 * 1000)
+        write_frozen(frozen, self.path)
+        with load_frozen(self.path).snapshot as snapshot:
+            loaded = MappedPowerSet(snapshot)
+            for i in range(1500):
+                self.assertEqual(loaded.seek('str' + str(i)), i < 1000)
+
+    def test_native_dictionary(self):
+        dictionary = nd.NativeDictionary(30)
+        dictionary.put('key', 'value')
+        dictionary.put('ключ', [1, 2, 3])
+        frozen = freeze_dictionary(dictionary)
+        self.assertIsInstance(frozen, MappedNativeDictionary)
+        self.assertEqual(frozen.len(), 2)
+        self.assertEqual(frozen.get('key'), 'value')
+        self.assertEqual(frozen.get('ключ'), [1, 2, 3])
+        self.assertIsNone(frozen.get('other'))
+        self.assertEqual(frozen.get_get_status(), nd.GetStatus.NotExist)
+        write_frozen(frozen, self.path)
+        loaded = load_frozen(self.path)
+        self.assertEqual(loaded.get('ключ'), [1, 2, 3])
+        self.assertFalse(loaded.exists('value'))
+        loaded.snapshot.close()
+
+    def test_empty(self):
+        frozen = freeze_table(PowerSet(10))
+        self.assertEqual(frozen.size(), 0)
+        self.assertFalse(frozen.seek('abc'))
+        self.assertEqual(list(frozen.values()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
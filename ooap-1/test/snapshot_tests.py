@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+import hash_table as ht
+import native_dictionary as nd
+from power_set import PowerSet
+from snapshot import *
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_hash_table(self):
+        table = ht.HashTable(30)
+        for string in ['abc', 'afqewf', 'adsggqw', 'wghweghehw', 'qwgqewgqgqe', 'abc', 'abc', 'cba']:
+            table.put(string)
+        write_table_snapshot(table, self.path)
+        mapped = load_snapshot(self.path)
+        self.assertIsInstance(mapped, MappedHashTable)
+        self.assertEqual(mapped.size(), table.size())
+        for string in ['abc', 'afqewf', 'adsggqw', 'wghweghehw', 'qwgqewgqgqe', 'cba']:
+            self.assertTrue(mapped.seek(string))
+            self.assertEqual(mapped.get_seek_status(), ht.SeekStatus.Ok)
+        self.assertEqual(mapped.count('abc'), 3)
+        self.assertFalse(mapped.seek('bac'))
+        mapped.seek(None)
+        self.assertEqual(mapped.get_seek_status(), ht.SeekStatus.IsNone)
+        mapped.put('bac')
+        self.assertEqual(mapped.get_put_status(), ht.PutStatus.Fail)
+        mapped.remove('abc')
+        self.assertEqual(mapped.get_remove_status(), ht.RemoveStatus.Fail)
+        mapped.snapshot.close()
+
+    def test_power_set(self):
+        p_set1 = PowerSet(30)
+        p_set2 = PowerSet(30)
+        for i in range(1000):
+            p_set1.put('str' + str(i))
+        for i in range(500, 1500):
+            p_set2.put('str' + str(i))
+        write_table_snapshot(p_set1, self.path)
+        with MappedSnapshot(self.path) as snapshot:
+            mapped = MappedPowerSet(snapshot)
+            self.assertEqual(mapped.size(), 1000)
+            self.assertEqual(mapped.union(p_set2).size(), 1500)
+            self.assertEqual(mapped.intersection(p_set2).size(), 500)
+            self.assertEqual(mapped.difference(p_set2).size(), 500)
+            self.assertTrue(mapped.is_subset(mapped.intersection(p_set2)))
+            self.assertFalse(mapped.is_subset(p_set2))
+
+    def test_native_dictionary(self):
+        dictionary = nd.NativeDictionary(30)
+        dictionary.put('key', 'value')
+        dictionary.put('ключ', [1, 2, 3])
+        write_dictionary_snapshot(dictionary, self.path)
+        mapped = load_snapshot(self.path)
+        self.assertIsInstance(mapped, MappedNativeDictionary)
+        self.assertEqual(mapped.len(), 2)
+        self.assertEqual(mapped.get('key'), 'value')
+        self.assertEqual(mapped.get('ключ'), [1, 2, 3])
+        self.assertEqual(mapped.get_get_status(), nd.GetStatus.Ok)
+        self.assertFalse(mapped.exists('missing'))
+        mapped.get('missing')
+        self.assertEqual(mapped.get_get_status(), nd.GetStatus.NotExist)
+        mapped.put('key', 'other')
+        self.assertEqual(mapped.get_put_status(), nd.PutStatus.Fail)
+        mapped.snapshot.close()
+
+    def test_mapped_operands(self):
+        p_set1 = PowerSet(30)
+        p_set2 = PowerSet(30)
+        for i in range(100):
+            p_set1.put('str' + str(i))
+        for i in range(50):
+            p_set2.put('str' + str(i))
+        handle, other_path = tempfile.mkstemp()
+        os.close(handle)
+        write_table_snapshot(p_set1, self.path)
+        write_table_snapshot(p_set2, other_path)
+        with MappedSnapshot(self.path) as snapshot1, MappedSnapshot(other_path) as snapshot2:
+            mapped1 = MappedPowerSet(snapshot1)
+            mapped2 = MappedPowerSet(snapshot2)
+            self.assertEqual(mapped1.union(mapped2).size(), 100)
+            self.assertEqual(mapped1.intersection(mapped2).size(), 50)
+            self.assertTrue(mapped1.is_subset(mapped2))
+            self.assertFalse(mapped2.is_subset(mapped1))
+        os.remove(other_path)
+
+    def test_values_are_not_pickled(self):
+        dictionary = nd.NativeDictionary(30)
+        dictionary.put('key', {'nested': [1, None, True]})
+        write_dictionary_snapshot(dictionary, self.path)
+        with MappedSnapshot(self.path) as snapshot:
+            self.assertEqual(MappedNativeDictionary(snapshot).get('key'), {'nested': [1, None, True]})
+            self.assertEqual(snapshot.find('key')[0], ValueKind.Json.value)
+
+
+if __name__ == '__main__':
+    unittest.main()
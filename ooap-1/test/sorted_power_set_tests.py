@@ -0,0 +1,84 @@
+import random
+import unittest
+import hash_table as ht
+from power_set import PowerSet
+from sorted_power_set import *
+
+
+class TestSortedPowerSet(unittest.TestCase):
+    def setUp(self):
+        self.strings = ['str%05d' % i for i in range(3000)]
+        self.shuffled = self.strings[:]
+        random.shuffle(self.shuffled)
+
+    def make_set(self, values):
+        result = SortedPowerSet()
+        for value in values:
+            result.put(value)
+        return result
+
+    def test_put_remove(self):
+        p_set = self.make_set(self.shuffled)
+        self.assertEqual(p_set.size(), 3000)
+        self.assertEqual(list(p_set), self.strings)
+        p_set.put(self.strings[0])
+        self.assertEqual(p_set.get_put_status(), ht.PutStatus.Exists)
+        for value in self.shuffled[:1500]:
+            p_set.remove(value)
+            self.assertEqual(p_set.get_remove_status(), ht.RemoveStatus.Ok)
+            self.assertFalse(p_set.seek(value))
+        self.assertEqual(list(p_set), sorted(self.shuffled[1500:]))
+        p_set.remove(self.shuffled[0])
+        self.assertEqual(p_set.get_remove_status(), ht.RemoveStatus.NotFound)
+        p_set.put(None)
+        self.assertEqual(p_set.get_put_status(), ht.PutStatus.IsNone)
+
+    def test_order_queries(self):
+        p_set = self.make_set(self.shuffled)
+        self.assertEqual(p_set.min(), self.strings[0])
+        self.assertEqual(p_set.get_min_status(), BoundStatus.Ok)
+        self.assertEqual(p_set.max(), self.strings[-1])
+        self.assertEqual(p_set.get_max_status(), BoundStatus.Ok)
+        self.assertEqual(list(p_set.range('str01000', 'str02000')), self.strings[1000:2000])
+        self.assertEqual(list(p_set.range('str', 'str00003')), self.strings[:3])
+        self.assertEqual(list(p_set.range('z', 'zz')), [])
+        self.assertEqual(p_set.rank('str01500'), 1500)
+        self.assertEqual(p_set.rank('z'), 3000)
+        empty = SortedPowerSet()
+        self.assertIsNone(empty.min())
+        self.assertEqual(empty.get_min_status(), BoundStatus.Empty)
+        self.assertIsNone(empty.max())
+        self.assertEqual(empty.get_max_status(), BoundStatus.Empty)
+
+    def test_set_algebra(self):
+        p_set1 = self.make_set(self.shuffled[:2000])
+        p_set2 = self.make_set(self.shuffled[1000:])
+        hashed = PowerSet(30)
+        for value in self.shuffled[1000:]:
+            hashed.put(value)
+        for other in [p_set2, hashed]:
+            self.assertEqual(list(p_set1.union(other)), self.strings)
+            self.assertEqual(list(p_set1.intersection(other)), sorted(self.shuffled[1000:2000]))
+            self.assertEqual(list(p_set1.difference(other)), sorted(self.shuffled[:1000]))
+            self.assertFalse(p_set1.is_subset(other))
+            self.assertTrue(p_set1.is_subset(p_set1.intersection(other)))
+        self.assertTrue(SortedPowerSet().is_subset(SortedPowerSet()))
+
+    def test_rank_after_splits_and_removes(self):
+        class SmallBlocks(SortedPowerSet):
+            BLOCK_SIZE = 4
+
+        p_set = SmallBlocks()
+        values = set()
+        for string in self.shuffled[:300]:
+            p_set.put(string)
+            values.add(string)
+        for string in self.shuffled[:300:3]:
+            p_set.remove(string)
+            values.discard(string)
+        for string in self.strings[:310]:
+            self.assertEqual(p_set.rank(string), sum(1 for value in values if value < string))
+
+
+if __name__ == '__main__':
+    unittest.main()
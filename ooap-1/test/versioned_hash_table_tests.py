@@ -0,0 +1,67 @@
+import unittest
+import hash_table as ht
+from power_set import PowerSet
+from versioned_hash_table import *
+
+
+class TestVersionedPowerSet(unittest.TestCase):
+    def setUp(self):
+        self.strings = ['str' + str(i) for i in range(1000)]
+
+    def test_snapshot_is_stable(self):
+        p_set = VersionedPowerSet(30)
+        for string in self.strings[:500]:
+            p_set.put(string)
+        snapshot = p_set.snapshot()
+        for string in self.strings[500:]:
+            p_set.put(string)
+        for string in self.strings[:100]:
+            p_set.remove(string)
+        self.assertEqual(p_set.size(), 900)
+        self.assertEqual(snapshot.size(), 500)
+        for string in self.strings[:500]:
+            self.assertTrue(snapshot.seek(string))
+            self.assertEqual(snapshot.get_seek_status(), ht.SeekStatus.Ok)
+        for string in self.strings[500:]:
+            self.assertFalse(snapshot.seek(string))
+        for string in self.strings[:100]:
+            self.assertFalse(p_set.seek(string))
+        values = [value for bucket in snapshot.data if bucket is not None for value, _ in bucket]
+        self.assertEqual(sorted(values), sorted(self.strings[:500]))
+        snapshot.put('abc')
+        self.assertEqual(snapshot.get_put_status(), ht.PutStatus.Fail)
+
+    def test_several_versions(self):
+        p_set = VersionedPowerSet(30)
+        p_set.put('abc')
+        first = p_set.snapshot()
+        same = p_set.snapshot()
+        p_set.put('cba')
+        second = p_set.snapshot()
+        p_set.remove('abc')
+        third = p_set.snapshot()
+        self.assertEqual([first.seek('abc'), first.seek('cba')], [True, False])
+        self.assertEqual([same.seek('abc'), same.seek('cba')], [True, False])
+        self.assertEqual([second.seek('abc'), second.seek('cba')], [True, True])
+        self.assertEqual([third.seek('abc'), third.seek('cba')], [False, True])
+
+    def test_set_algebra(self):
+        p_set = VersionedPowerSet(30)
+        other = PowerSet(30)
+        for string in self.strings[:500]:
+            p_set.put(string)
+        for string in self.strings[250:750]:
+            other.put(string)
+        snapshot = p_set.snapshot()
+        for string in self.strings[:500]:
+            p_set.remove(string)
+        self.assertEqual(p_set.size(), 0)
+        self.assertEqual(snapshot.union(other).size(), 750)
+        self.assertEqual(snapshot.intersection(other).size(), 250)
+        self.assertEqual(snapshot.difference(other).size(), 250)
+        self.assertEqual(other.difference(snapshot).size(), 250)
+        self.assertTrue(snapshot.is_subset(snapshot.intersection(other)))
+
+
+if __name__ == '__main__':
+    unittest.main()
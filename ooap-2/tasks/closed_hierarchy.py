@@ -1,15 +1,47 @@
 import copy
 import json
-from abc import ABC, abstractmethod
+from abc import ABC, ABCMeta, abstractmethod
 
 CLASS_KEY = 'class'
 
+# Кэш отношений между типами: (тип, предполагаемый предок) -> является ли потомком
+# Заполняется лениво, сбрасывается при определении нового потомка General
+# и при регистрации виртуального потомка через General.register
+_SUBTYPE_CACHE = {}
+
+
+def _is_subtype(cls, base):
+    key = (cls, base)
+    result = _SUBTYPE_CACHE.get(key)
+    if result is None:
+        result = _SUBTYPE_CACHE[key] = issubclass(cls, base)
+    return result
+
 
 # Базовый класс General, реализующий базовую функциональность для всех потомков
 # Класс использует рефлексию для выполнения базовых операций
 # Это позволяет применить методы ко всем потомкам без переопределения методов
 # Все методы объявлены абстрактными, поэтому нельзя создать экземпляр
 class General(ABC):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _SUBTYPE_CACHE.clear()
+
+    @classmethod
+    def register(cls, subclass):
+        result = ABCMeta.register(cls, subclass)
+        _SUBTYPE_CACHE.clear()
+        return result
+
+    # Декоратор регистрирует функцию в dispatcher как обработчик этого типа и его потомков:
+    # @Animal.handled_by(make_animal_speak)
+    @classmethod
+    def handled_by(cls, dispatcher, batch_handler=None):
+        def register(handler):
+            dispatcher.register(cls, handler, batch_handler)
+            return handler
+        return register
+
     @abstractmethod
     def copy(self, other):
         if not self.is_same_type(other):
@@ -54,7 +86,7 @@ class General(ABC):
 
     @abstractmethod
     def is_instance_of(self, cls):
-        return isinstance(self, cls)
+        return _is_subtype(type(self), cls)
 
     @abstractmethod
     def get_real_type(self):
@@ -62,7 +94,22 @@ class General(ABC):
 
     @abstractmethod
     def is_same_type(self, other):
-        return self.is_instance_of(type(other))
+        return _is_subtype(type(self), type(other))
+
+    @abstractmethod
+    def assignment_attempt(self, source):
+        if not _is_subtype(type(source), type(self)):
+            return Void()
+        return source
+
+    # Попытка присваивания для списка: подходящие объекты остаются на месте, остальные заменяются на Void
+    # Отношение типов проверяется один раз для каждого встреченного типа
+    @abstractmethod
+    def assignment_attempt_many(self, sources):
+        target = type(self)
+        matching = {source_type: _is_subtype(source_type, target) for source_type in set(map(type, sources))}
+        void = Void()
+        return [source if matching[type(source)] else void for source in sources]
 
 
 # Класс Any не определяет новых методов, служит базовым классом для остальной иерархии
@@ -94,6 +141,12 @@ class Any(General):
     def is_same_type(self, other):
         return super().is_same_type(other)
 
+    def assignment_attempt(self, source):
+        return super().assignment_attempt(source)
+
+    def assignment_attempt_many(self, sources):
+        return super().assignment_attempt_many(sources)
+
 
 class Animal(Any):
     @abstractmethod
@@ -136,19 +189,69 @@ class Void(Dog, Cat, Human, Bomb):
         return cls._instance
 
 
-def make_animal_speak(animal: Animal):
-    if not isinstance(animal, Any):
-        print('Please use our type system! What is', type(animal), '?')
-        return
-    if not isinstance(animal, Animal):
-        print(animal.print(), "is not an animal!")
-        return
-    if animal == Void():
-        print('Animal does not exist!')
-        return
+# Реестр обработчиков, выбираемых по типу объекта вместо цепочки проверок isinstance
+# Обработчик ищется по MRO типа один раз, дальше берется из кэша по type(obj)
+# Обработчик для object срабатывает для любых объектов, в том числе вне иерархии General
+class Dispatcher:
+    def __init__(self):
+        self.__handlers = {}
+        self.__cache = {}
+
+    # batch_handler получает список объектов одного типа; если не задан, handler вызывается для каждого
+    def register(self, cls, handler, batch_handler=None):
+        if batch_handler is None:
+            batch_handler = lambda objects: [handler(obj) for obj in objects]
+        self.__handlers[cls] = (handler, batch_handler)
+        self.__cache.clear()
+
+    def __resolve(self, cls):
+        result = self.__cache.get(cls)
+        if result is None:
+            result = next((self.__handlers[base] for base in cls.__mro__ if base in self.__handlers), None)
+            if result is None:
+                raise TypeError('No handler for ' + str(cls))
+            self.__cache[cls] = result
+        return result
+
+    def __call__(self, obj):
+        return self.__resolve(type(obj))[0](obj)
+
+    # Объекты группируются по типу, обработчик вызывается один раз для группы
+    # Группы обрабатываются в порядке первого появления типа в списке
+    def dispatch_many(self, objects):
+        groups = {}
+        for obj in objects:
+            groups.setdefault(type(obj), []).append(obj)
+        for cls, group in groups.items():
+            self.__resolve(cls)[1](group)
+
+
+make_animal_speak = Dispatcher()
+
+
+@Animal.handled_by(make_animal_speak)
+def _speak(animal):
     animal.speak()
 
 
+@Any.handled_by(make_animal_speak)
+def _not_an_animal(machine):
+    print(machine.print(), "is not an animal!")
+
+
+# Типы вне иерархии General регистрируются напрямую
+def _unknown_type(obj):
+    print('Please use our type system! What is', type(obj), '?')
+
+
+@Void.handled_by(make_animal_speak)
+def _does_not_exist(void):
+    print('Animal does not exist!')
+
+
+make_animal_speak.register(object, _unknown_type)
+
+
 if __name__ == '__main__':
     me = Human()
     my_pet = Cat()
@@ -164,4 +267,14 @@ if __name__ == '__main__':
     #   Woof!
     #   Animal does not exist!
     #   Bomb{} is not an animal!
+    #   Please use our type system! What is <class 'NoneType'> ?
+    make_animal_speak.dispatch_many(local_animals + [Cat(), Void()])
+    # OUTPUT:
+    #   Hi!
+    #   Meow!
+    #   Meow!
+    #   Woof!
+    #   Animal does not exist!
+    #   Animal does not exist!
+    #   Bomb{} is not an animal!
     #   Please use our type system! What is <class 'NoneType'> ?
\ No newline at end of file
@@ -1,3 +1,10 @@
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 # Example of extension
 
 
@@ -34,20 +41,87 @@ my_dog.bark()  # Unique to Dog
 
 
 # Base class
+# FIELDS are the numeric fields stored by ShapeCollection in columns
 class Shape:
+    FIELDS = ()
+
     def area(self):
         return 0
 
+    # Areas of count shapes of this class given as columns: field name -> array('d')
+    # Returns array('d') of count areas
+    @classmethod
+    def areas(cls, columns, count):
+        return array('d', bytes(count * array('d').itemsize))
+
 
 # Child class specializing Shape
 class Circle(Shape):
+    FIELDS = ('radius',)
+
     def __init__(self, radius):
         self.radius = radius
 
     def area(self):
         return 3.14 * self.radius * self.radius
 
+    @classmethod
+    def areas(cls, columns, count):
+        radius = columns['radius']
+        if numpy is not None:
+            radius = numpy.frombuffer(radius, dtype=numpy.float64)
+            return array('d', (3.14 * radius * radius).tobytes())
+        return array('d', [3.14 * r * r for r in radius])
+
+
+# Columnar storage of many shapes: fields of every concrete class are kept in typed arrays
+# Polymorphism works per class column: areas() is called once for all shapes of a class
+class ShapeCollection:
+    def __init__(self):
+        self.__columns = {}
+        self.__counts = {}
+
+    def __len__(self):
+        return sum(self.__counts.values())
+
+    def __columns_of(self, cls):
+        columns = self.__columns.get(cls)
+        if columns is None:
+            columns = self.__columns[cls] = {field: array('d') for field in cls.FIELDS}
+            self.__counts[cls] = 0
+        return columns
+
+    def add(self, shape):
+        for field, column in self.__columns_of(type(shape)).items():
+            column.append(getattr(shape, field))
+        self.__counts[type(shape)] += 1
+
+    # Adds count shapes of class cls without creating objects, fields are given as sequences of values
+    # Raises ValueError if a field of the class is missing or has other than count values
+    def extend(self, cls, count, **fields):
+        for field in cls.FIELDS:
+            if field not in fields or len(fields[field]) != count:
+                raise ValueError(f"Field '{field}' of {cls.__name__} must have {count} values")
+        for field, column in self.__columns_of(cls).items():
+            column.extend(fields[field])
+        self.__counts[cls] += count
+
+    # Iterate over (class, areas of all shapes of the class)
+    def areas(self):
+        for cls, columns in self.__columns.items():
+            yield cls, cls.areas(columns, self.__counts[cls])
+
+    def total_area(self):
+        total = numpy.sum if numpy is not None else sum
+        return sum(float(total(areas)) for _, areas in self.areas())
+
 
 # Example usage
 circle = Circle(5)
 print("Area of the circle:", circle.area())
+
+shapes = ShapeCollection()
+shapes.add(circle)
+shapes.add(Shape())
+shapes.extend(Circle, 3, radius=[1, 2, 3])
+print("Total area of", len(shapes), "shapes:", shapes.total_area())
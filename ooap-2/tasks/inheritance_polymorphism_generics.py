@@ -1,57 +1,1109 @@
 import copy
 import json
+import functools
+import hashlib
+import inspect
+import multiprocessing
+import operator
+import re
+import struct
+import sys
+import weakref
 from abc import ABC, abstractmethod
+from array import array
+from collections.abc import MutableSequence, MutableMapping
+from enum import Enum
+from itertools import islice
 from typing import Generic, TypeVar, Protocol
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 CLASS_KEY = 'class'
+ARRAY_KEY = '__array__'
+ESCAPE_KEY = '__escaped__'
+_RESERVED_KEYS = frozenset((CLASS_KEY, ARRAY_KEY, ESCAPE_KEY))
+
+
+# Поля объекта со слотами в виде словаря: чтение и запись идут через атрибуты объекта
+class SlotFields(MutableMapping):
+    __slots__ = ('__obj', '__names')
+
+    def __init__(self, obj):
+        self.__obj = obj
+        self.__names = _slot_names(type(obj))
+
+    def __getitem__(self, name):
+        if name not in self.__names:
+            raise KeyError(name)
+        try:
+            return getattr(self.__obj, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __setitem__(self, name, value):
+        setattr(self.__obj, name, value)
+
+    def __delitem__(self, name):
+        try:
+            delattr(self.__obj, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __iter__(self):
+        return (name for name in self.__names if hasattr(self.__obj, name))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+_SLOT_NAMES = {}
+
+
+# Имена слотов класса и его предков, имена приватных слотов искажаются как в теле класса
+def _slot_names(cls):
+    names = _SLOT_NAMES.get(cls)
+    if names is None:
+        names = []
+        for base in reversed(cls.__mro__):
+            slots = base.__dict__.get('__slots__', ())
+            for name in [slots] if isinstance(slots, str) else slots:
+                if name in ('__dict__', '__weakref__'):
+                    continue
+                if name.startswith('__') and not name.endswith('__'):
+                    name = '_' + base.__name__.lstrip('_') + name
+                names.append(name)
+        names = _SLOT_NAMES[cls] = tuple(names)
+    return names
+
+
+# Поля объекта General: __dict__ либо представление слотов
+# Поля лениво десериализованного объекта при этом декодируются полностью
+def _fields(obj):
+    try:
+        fields = obj.__dict__
+    except AttributeError:
+        return SlotFields(obj)
+    if _LAZY_STATES:
+        state = _LAZY_STATES.get(id(obj))
+        if state is not None and not state.complete:
+            state.materialize(fields)
+    return fields
+
+
+_JSON_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.S)
+_JSON_SPACE = re.compile(r'\s*')
+_JSON_SCALAR = re.compile(r'[^,\]}\s]+')
+_JSON_STRUCTURE = re.compile(r'["{}\[\]]')
+
+
+# Возвращает позицию за концом JSON-значения, начинающегося в pos, не разбирая его
+def _skip_json_value(text, pos):
+    if text[pos] == '"':
+        return _JSON_STRING.match(text, pos).end()
+    if text[pos] not in '{[':
+        return _JSON_SCALAR.match(text, pos).end()
+    depth = 0
+    while True:
+        pos = _JSON_STRUCTURE.search(text, pos).start()
+        char = text[pos]
+        if char == '"':
+            pos = _JSON_STRING.match(text, pos).end()
+            continue
+        depth += 1 if char in '{[' else -1
+        pos += 1
+        if depth == 0:
+            return pos
+
+
+# Границы значений полей JSON-объекта верхнего уровня: {имя: (начало, конец)}
+def _json_object_spans(text):
+    pos = _JSON_SPACE.match(text).end()
+    if text[pos] != '{':
+        raise ValueError('Expected JSON object')
+    spans = {}
+    pos = _JSON_SPACE.match(text, pos + 1).end()
+    while text[pos] != '}':
+        key_end = _JSON_STRING.match(text, pos).end()
+        key = json.loads(text[pos:key_end])
+        pos = _JSON_SPACE.match(text, _JSON_SPACE.match(text, key_end).end() + 1).end()
+        end = _skip_json_value(text, pos)
+        spans[key] = (pos, end)
+        pos = _JSON_SPACE.match(text, end).end()
+        if text[pos] == ',':
+            pos = _JSON_SPACE.match(text, pos + 1).end()
+    return spans
+
+
+# Состояние лениво десериализованного объекта: исходный текст, границы полей и уже декодированные значения
+# Поле декодируется при первом обращении; неизмененные поля при повторной сериализации берутся из исходного текста
+class _LazyState:
+    def __init__(self, text, spans):
+        self.text = text
+        self.spans = spans
+        self.decoded = {}
+        self.complete = len(spans) == 0
+
+    def raw(self, name):
+        start, end = self.spans[name]
+        return self.text[start:end]
+
+    def decode(self, fields, name):
+        value = fields[name] = self.decoded[name] = JSON_CODEC.loads(self.raw(name))
+        self.complete = len(self.decoded) == len(self.spans)
+        return value
+
+    # Поля, записанные до декодирования, не перезаписываются
+    def materialize(self, fields):
+        for name in self.spans:
+            if name not in self.decoded and name not in fields:
+                self.decode(fields, name)
+        self.complete = True
+
+    # Поле изменено, если его записали, не читая, заменили либо если декодированное значение изменяемое
+    def is_dirty(self, fields, name):
+        if name not in fields:
+            return False
+        value = fields[name]
+        if name not in self.decoded:
+            return True
+        return value is not self.decoded[name] or not _is_shareable(value)
+
+
+# id объекта -> _LazyState, запись удаляется вместе с объектом
+_LAZY_STATES = {}
+
+
+# Реестр классов иерархии: каждому потомку General присваивается целый идентификатор
+# Идентификатор - явный CLASS_ID класса либо 32 бита хеша от модуля и qualname, он не зависит
+# от порядка определения классов. Совпадение явных идентификаторов - ошибка
+# Классы с одинаковой меткой str(cls) или идентификатором (например, созданные одной фабрикой)
+# по данным не различить: такая метка разрешается только в класс, который ожидает вызывающий
+class ClassRegistry:
+    __AMBIGUOUS = object()
+
+    def __init__(self):
+        self.__ids = {}
+        self.__by_id = {}
+        self.__by_tag = {}
+
+    @staticmethod
+    def __class_id(cls):
+        class_id = cls.__dict__.get('CLASS_ID')
+        if class_id is None:
+            name = f'{cls.__module__}.{cls.__qualname__}'.encode()
+            class_id = int.from_bytes(hashlib.blake2b(name, digest_size=4).digest(), 'little')
+        return class_id
+
+    def register(self, cls):
+        if cls in self.__ids:
+            return
+        class_id = self.__class_id(cls)
+        if 'CLASS_ID' in cls.__dict__ and self.__by_id.get(class_id, cls) is not cls:
+            raise TypeError(f'Class id {class_id} of {cls} is already taken')
+        self.__ids[cls] = class_id
+        self.__by_id[class_id] = cls if class_id not in self.__by_id else self.__AMBIGUOUS
+        tag = str(cls)
+        self.__by_tag[tag] = cls if tag not in self.__by_tag else self.__AMBIGUOUS
+
+    def get_id(self, cls):
+        return self.__ids[cls]
+
+    # tag записан вместе с идентификатором и проверяет, что идентификатор означает тот же класс
+    def get_class(self, class_id, tag, expected=None):
+        if expected is not None and self.__ids.get(expected) == class_id and str(expected) == tag:
+            return expected
+        cls = self.__by_id.get(class_id)
+        if cls is self.__AMBIGUOUS:
+            raise TypeError(f'Ambiguous class id {class_id} of {tag}')
+        if cls is None or str(cls) != tag:
+            raise TypeError(f'Unknown deserialized class {tag}')
+        return cls
+
+    def find_by_tag(self, tag, expected=None):
+        if expected is not None and str(expected) == tag:
+            return expected
+        cls = self.__by_tag.get(tag)
+        if cls is self.__AMBIGUOUS:
+            raise TypeError(f'Ambiguous class tag {tag}')
+        return cls
+
+
+CLASS_REGISTRY = ClassRegistry()
+
+
+# Кодек переводит объекты General в данные и обратно
+class Codec(ABC):
+    @abstractmethod
+    def dumps(self, obj):
+        pass
+
+    @abstractmethod
+    def dump(self, obj, stream):
+        pass
+
+    # expected - класс, в который разрешаются неоднозначные метки (см. ClassRegistry)
+    @abstractmethod
+    def loads(self, data, expected=None):
+        pass
+
+    @abstractmethod
+    def load(self, stream, expected=None):
+        pass
+
+    # Пакетные операции: схема каждой раскладки (класс + набор полей) записывается один раз на пакет
+    @abstractmethod
+    def dumps_many(self, objects):
+        pass
+
+    @abstractmethod
+    def loads_many(self, data):
+        pass
+
+    def dump_many(self, objects, stream):
+        stream.write(self.dumps_many(objects))
+
+    # Ленивая десериализация в obj; по умолчанию объект декодируется сразу
+    def load_lazy(self, obj, data):
+        obj.deserialize(data, self)
+
+    def load_many(self, stream):
+        return self.loads_many(stream.read())
+
+
+# Словарь пользователя, содержащий служебный ключ, не должен читаться как метка объекта или массива,
+# поэтому он записывается как {ESCAPE_KEY: [[ключ, значение], ...]}
+def _needs_escape(value):
+    if isinstance(value, dict):
+        return not _RESERVED_KEYS.isdisjoint(value) or any(_needs_escape(element) for element in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_needs_escape(element) for element in value)
+    return False
+
+
+def _escaped(value):
+    if isinstance(value, dict):
+        if _RESERVED_KEYS.isdisjoint(value):
+            return {key: _escaped(element) for key, element in value.items()}
+        return {ESCAPE_KEY: [[key, _escaped(element)] for key, element in value.items()]}
+    if isinstance(value, (list, tuple)):
+        return [_escaped(element) for element in value]
+    return value
+
+
+def _json_value(value):
+    return _escaped(value) if _needs_escape(value) else value
+
+
+# Текстовый формат: JSON, класс определяется меткой str(type)
+class JsonCodec(Codec):
+    # Поля объекта вместе с меткой класса, без копирования значений
+    # Используется как default для json: вложенные объекты General сериализуются рекурсивно
+    @staticmethod
+    def _serializable(obj):
+        if isinstance(obj, FieldProxy):
+            return _json_value(obj.unwrap())
+        if isinstance(obj, array):
+            return {ARRAY_KEY: obj.typecode, 'values': obj.tolist()}
+        if not isinstance(obj, General):
+            raise TypeError(f'Object of type {type(obj).__name__} is not serializable')
+        fields = _FastPaths.of_object(obj).to_fields(_fields(obj))
+        for name, value in fields.items():
+            if _needs_escape(value):
+                fields[name] = _escaped(value)
+        return fields
+
+    # Восстанавливает вложенные объекты General по метке класса
+    @staticmethod
+    def _deserialized(fields, expected=None):
+        if ESCAPE_KEY in fields:
+            return dict(fields[ESCAPE_KEY])
+        if ARRAY_KEY in fields:
+            return array(fields[ARRAY_KEY], fields['values'])
+        if CLASS_KEY not in fields:
+            return fields
+        cls = CLASS_REGISTRY.find_by_tag(fields.pop(CLASS_KEY), expected)
+        if cls is None:
+            raise TypeError('Unknown deserialized class')
+        obj = cls.__new__(cls)
+        _fields(obj).update(fields)
+        return _pooled(obj)
+
+    # Лениво десериализованный объект собирается из исходного текста неизмененных полей
+    def _dumps_lazy(self, obj, state):
+        fields = obj.__dict__
+        if len(state.decoded) == 0 and len(fields) == 0:
+            return state.text
+        parts = [f'{json.dumps(CLASS_KEY)}: {json.dumps(str(obj.get_real_type()))}']
+        for name in state.spans:
+            if name in state.decoded and name not in fields:
+                continue
+            value = state.raw(name) if not state.is_dirty(fields, name) \
+                else json.dumps(_json_value(fields[name]), default=self._serializable)
+            parts.append(f'{json.dumps(name)}: {value}')
+        for name, value in fields.items():
+            if name not in state.spans:
+                parts.append(f'{json.dumps(name)}: {json.dumps(_json_value(value), default=self._serializable)}')
+        return '{' + ', '.join(parts) + '}'
+
+    def dumps(self, obj):
+        state = _LAZY_STATES.get(id(obj)) if _LAZY_STATES else None
+        if state is not None:
+            return self._dumps_lazy(obj, state)
+        return json.dumps(obj, default=self._serializable)
+
+    def dump(self, obj, stream):
+        if _LAZY_STATES and id(obj) in _LAZY_STATES:
+            stream.write(self.dumps(obj))
+            return
+        json.dump(obj, stream, default=self._serializable)
+
+    # Индексирует поля без разбора значений; объект со слотами декодируется сразу
+    def load_lazy(self, obj, data):
+        text = data.read() if hasattr(data, 'read') else data
+        if isinstance(text, (bytes, bytearray)):
+            text = text.decode()
+        text = text.strip()
+        if not hasattr(obj, '__dict__'):
+            super().load_lazy(obj, text)
+            return
+        spans = _json_object_spans(text)
+        tag = spans.pop(CLASS_KEY, None)
+        if tag is None or json.loads(text[tag[0]:tag[1]]) != str(obj.get_real_type()):
+            raise TypeError('Wrong deserialized class')
+        for name in spans:
+            obj.__dict__.pop(name, None)
+        _LAZY_STATES[id(obj)] = _LazyState(text, spans)
+        weakref.finalize(obj, _LAZY_STATES.pop, id(obj), None)
+
+    def loads(self, data, expected=None):
+        if expected is None:
+            return json.loads(data, object_hook=self._deserialized)
+        return json.loads(data, object_hook=lambda fields: self._deserialized(fields, expected))
+
+    def load(self, stream, expected=None):
+        return self.loads(stream.read(), expected)
+
+    # {"schemas": [[метка класса, [имена полей]], ...], "rows": [[номер схемы, значения полей...], ...]}
+    def dumps_many(self, objects):
+        layouts = {}
+        schemas = []
+        rows = []
+        for obj in objects:
+            if not isinstance(obj, General):
+                raise TypeError(f'Object of type {type(obj).__name__} is not serializable')
+            fields = _fields(obj)
+            key = (type(obj), tuple(fields))
+            layout = layouts.get(key)
+            if layout is None:
+                layout = layouts[key] = len(schemas)
+                schemas.append([str(key[0]), key[1]])
+            rows.append([layout, *map(_json_value, fields.values())])
+        return json.dumps({'schemas': schemas, 'rows': rows}, default=self._serializable)
+
+    def loads_many(self, data):
+        batch = json.loads(data, object_hook=self._deserialized)
+        schemas = []
+        for tag, names in batch['schemas']:
+            cls = CLASS_REGISTRY.find_by_tag(tag)
+            if cls is None:
+                raise TypeError('Unknown deserialized class')
+            schemas.append((cls, tuple(names)))
+        result = []
+        for row in batch['rows']:
+            cls, names = schemas[row[0]]
+            result.append(_FastPaths.of(cls, names).from_values(row[1:]))
+        return result
+
+
+# Двоичный формат в духе msgpack
+# Класс объекта кодируется идентификатором из реестра и меткой для проверки, имена полей записываются один раз
+# на раскладку (класс + набор полей) в пределах одной записи, дальше - номер раскладки
+class BinaryCodec(Codec):
+    NONE = 0xc0
+    FALSE = 0xc2
+    TRUE = 0xc3
+    FLOAT = 0xcb
+    INT = 0xd3
+    BIG_INT = 0xc8
+    STR = 0xd9
+    BYTES = 0xc4
+    LIST = 0xdd
+    DICT = 0xdf
+    OBJECT = 0xd4
+    NEW_LAYOUT = 0xd5
+    ARRAY = 0xc9
+    FIX_INT_LIMIT = 0x80
+
+    DOUBLE = struct.Struct('<d')
+    INT64 = struct.Struct('<q')
+
+    def __init__(self):
+        # Закодированные имена полей для каждой раскладки
+        self.__layout_cache = {}
+
+    @staticmethod
+    def _write_size(out, size):
+        while size >= 0x80:
+            out.append(size & 0x7f | 0x80)
+            size >>= 7
+        out.append(size)
+
+    @staticmethod
+    def _read_size(data, pos):
+        size = 0
+        shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            size |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return size, pos
+            shift += 7
+
+    def _write_str(self, out, value):
+        encoded = value.encode()
+        self._write_size(out, len(encoded))
+        out += encoded
+
+    def _encoded_layout(self, cls, names):
+        key = (cls, names)
+        encoded = self.__layout_cache.get(key)
+        if encoded is None:
+            encoded = bytearray()
+            self._write_size(encoded, CLASS_REGISTRY.get_id(cls))
+            self._write_str(encoded, str(cls))
+            self._write_size(encoded, len(names))
+            for name in names:
+                self._write_str(encoded, name)
+            encoded = self.__layout_cache[key] = bytes(encoded)
+        return encoded
+
+    def _write(self, out, value, layouts):
+        if value is None:
+            out.append(self.NONE)
+        elif value is True:
+            out.append(self.TRUE)
+        elif value is False:
+            out.append(self.FALSE)
+        elif isinstance(value, int):
+            if 0 <= value < self.FIX_INT_LIMIT:
+                out.append(value)
+            elif -2 ** 63 <= value < 2 ** 63:
+                out.append(self.INT)
+                out += self.INT64.pack(value)
+            else:
+                encoded = value.to_bytes((value.bit_length() + 8) // 8, 'little', signed=True)
+                out.append(self.BIG_INT)
+                self._write_size(out, len(encoded))
+                out += encoded
+        elif isinstance(value, float):
+            out.append(self.FLOAT)
+            out += self.DOUBLE.pack(value)
+        elif isinstance(value, str):
+            out.append(self.STR)
+            self._write_str(out, value)
+        elif isinstance(value, bytes):
+            out.append(self.BYTES)
+            self._write_size(out, len(value))
+            out += value
+        elif isinstance(value, FieldProxy):
+            self._write(out, value.unwrap(), layouts)
+        elif isinstance(value, array):
+            out.append(self.ARRAY)
+            out += value.typecode.encode()
+            self._write_size(out, len(value))
+            out += (value if sys.byteorder == 'little' else _byteswapped(value)).tobytes()
+        elif isinstance(value, (list, tuple)):
+            out.append(self.LIST)
+            self._write_size(out, len(value))
+            for element in value:
+                self._write(out, element, layouts)
+        elif isinstance(value, dict):
+            out.append(self.DICT)
+            self._write_size(out, len(value))
+            for key, element in value.items():
+                self._write(out, key, layouts)
+                self._write(out, element, layouts)
+        elif isinstance(value, General):
+            fields = _fields(value)
+            key = (type(value), tuple(fields))
+            layout = layouts.get(key)
+            if layout is None:
+                layout = layouts[key] = len(layouts)
+                out.append(self.NEW_LAYOUT)
+                out += self._encoded_layout(*key)
+            else:
+                out.append(self.OBJECT)
+                self._write_size(out, layout)
+            for element in fields.values():
+                self._write(out, element, layouts)
+        else:
+            raise TypeError(f'Object of type {type(value).__name__} is not serializable')
+
+    def _read(self, data, pos, layouts, expected=None):
+        tag = data[pos]
+        pos += 1
+        if tag < self.FIX_INT_LIMIT:
+            return tag, pos
+        if tag == self.NONE:
+            return None, pos
+        if tag == self.TRUE:
+            return True, pos
+        if tag == self.FALSE:
+            return False, pos
+        if tag == self.INT:
+            return self.INT64.unpack_from(data, pos)[0], pos + self.INT64.size
+        if tag == self.FLOAT:
+            return self.DOUBLE.unpack_from(data, pos)[0], pos + self.DOUBLE.size
+        if tag == self.ARRAY:
+            result = array(chr(data[pos]))
+            size, pos = self._read_size(data, pos + 1)
+            end = pos + size * result.itemsize
+            result.frombytes(data[pos:end])
+            return (result if sys.byteorder == 'little' else _byteswapped(result)), end
+        if tag in (self.STR, self.BYTES, self.BIG_INT):
+            size, pos = self._read_size(data, pos)
+            raw = data[pos:pos + size]
+            if tag == self.STR:
+                return str(raw, 'utf-8'), pos + size
+            if tag == self.BIG_INT:
+                return int.from_bytes(raw, 'little', signed=True), pos + size
+            return bytes(raw), pos + size
+        if tag == self.LIST:
+            size, pos = self._read_size(data, pos)
+            result = []
+            for _ in range(size):
+                element, pos = self._read(data, pos, layouts, expected)
+                result.append(element)
+            return result, pos
+        if tag == self.DICT:
+            size, pos = self._read_size(data, pos)
+            result = {}
+            for _ in range(size):
+                key, pos = self._read(data, pos, layouts, expected)
+                result[key], pos = self._read(data, pos, layouts, expected)
+            return result, pos
+        if tag == self.NEW_LAYOUT:
+            class_id, pos = self._read_size(data, pos)
+            size, pos = self._read_size(data, pos)
+            class_tag = str(data[pos:pos + size], 'utf-8')
+            pos += size
+            count, pos = self._read_size(data, pos)
+            names = []
+            for _ in range(count):
+                size, pos = self._read_size(data, pos)
+                names.append(str(data[pos:pos + size], 'utf-8'))
+                pos += size
+            cls, names = layouts[len(layouts)] = CLASS_REGISTRY.get_class(class_id, class_tag, expected), names
+        elif tag == self.OBJECT:
+            layout, pos = self._read_size(data, pos)
+            cls, names = layouts[layout]
+        else:
+            raise ValueError(f'Unknown tag {tag:#x}')
+        obj = cls.__new__(cls)
+        fields = _fields(obj)
+        for name in names:
+            fields[name], pos = self._read(data, pos, layouts, expected)
+        return _pooled(obj), pos
+
+    def dumps(self, obj):
+        out = bytearray()
+        self._write(out, obj, {})
+        return bytes(out)
+
+    def dump(self, obj, stream):
+        stream.write(self.dumps(obj))
+
+    def loads(self, data, expected=None):
+        obj, _ = self._read(memoryview(data), 0, {}, expected)
+        return obj
+
+    def load(self, stream, expected=None):
+        return self.loads(stream.read(), expected)
+
+    # Количество объектов, затем объекты; раскладки общие для всего пакета
+    def dumps_many(self, objects):
+        out = bytearray()
+        objects = list(objects)
+        self._write_size(out, len(objects))
+        layouts = {}
+        for obj in objects:
+            if not isinstance(obj, General):
+                raise TypeError(f'Object of type {type(obj).__name__} is not serializable')
+            self._write(out, obj, layouts)
+        return bytes(out)
+
+    def loads_many(self, data):
+        data = memoryview(data)
+        count, pos = self._read_size(data, 0)
+        layouts = {}
+        result = []
+        for _ in range(count):
+            obj, pos = self._read(data, pos, layouts)
+            result.append(obj)
+        return result
+
+
+def _byteswapped(values):
+    result = array(values.typecode, values)
+    result.byteswap()
+    return result
+
+
+JSON_CODEC = JsonCodec()
+BINARY_CODEC = BinaryCodec()
+
+
+class CloneMode(Enum):
+    Deep = 0
+    Shared = 1
+
+
+_IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes, frozenset)
+
+
+# Значение можно разделять между оригиналом и клоном без копирования
+def _is_shareable(value):
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return True
+    if isinstance(value, tuple):
+        return all(_is_shareable(element) for element in value)
+    return isinstance(value, General) and value.IMMUTABLE
+
+
+# Значение поля, подменяющее собой реальное значение (контейнер или результат вычисления)
+# Сериализация, сравнение и хеширование работают с реальным значением, которое возвращает unwrap
+class FieldProxy(ABC):
+    @abstractmethod
+    def unwrap(self):
+        pass
+
+
+# Контейнер с копированием при записи
+# Несколько прокси разделяют одно хранилище, пока один из них не начнет его менять:
+# тогда он делает собственную копию, элементы копии клонируются в режиме CloneMode.Shared
+# Изменяемые элементы (не _is_shareable) тоже разделяются, поэтому их чтение также приводит к копированию
+# Прокси создаются только у клона: оригинал сохраняет свои list и dict
+# Прокси поддерживают операции list и dict, но не являются их экземплярами: isinstance(value, list) ложно,
+# copy() и операторы (+, *, |) возвращают обычные list и dict
+class CowContainer(FieldProxy):
+    def __init__(self, data, owned=False):
+        self._data = data
+        self._owned = owned
+
+    # Новый прокси над тем же хранилищем, оба прокси становятся неизменяемыми до первой записи
+    def share(self):
+        self._owned = False
+        return type(self)(self._data)
+
+    # Хранилище только для чтения
+    def unwrap(self):
+        return self._data
+
+    def _materialize(self):
+        if not self._owned:
+            self._data = self._copy_data()
+            self._owned = True
+
+    def _readable(self, value):
+        if self._owned or _is_shareable(value):
+            return value
+        self._materialize()
+        return None
+
+    # Обычный контейнер с собственной копией элементов
+    def copy(self):
+        self._materialize()
+        return self._data.copy()
+
+    @staticmethod
+    def _plain(value):
+        return value.copy() if isinstance(value, CowContainer) else value
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        return self._data == (other.unwrap() if isinstance(other, FieldProxy) else other)
+
+    def __repr__(self):
+        return repr(self._data)
+
+    def __deepcopy__(self, memo):
+        return type(self)(copy.deepcopy(self._data, memo), True)
+
+
+class CowList(CowContainer, MutableSequence):
+    def _copy_data(self):
+        memo = {}
+        return [_shared_clone(value, memo) for value in self._data]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._materialize()
+            return self._data[index]
+        value = self._readable(self._data[index])
+        return self._data[index] if value is None else value
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __setitem__(self, index, value):
+        self._materialize()
+        self._data[index] = value
+
+    def __delitem__(self, index):
+        self._materialize()
+        del self._data[index]
+
+    def insert(self, index, value):
+        self._materialize()
+        self._data.insert(index, value)
+
+    def sort(self, *, key=None, reverse=False):
+        self._materialize()
+        self._data.sort(key=key, reverse=reverse)
+
+    def __contains__(self, value):
+        return value in self._data
+
+    def __add__(self, other):
+        return self.copy() + self._plain(other)
+
+    def __radd__(self, other):
+        return self._plain(other) + self.copy()
+
+    def __mul__(self, count):
+        return self.copy() * count
+
+    __rmul__ = __mul__
+
+    def __imul__(self, count):
+        self._materialize()
+        self._data *= count
+        return self
+
+    def __lt__(self, other):
+        return self._data < self._plain(other)
+
+    def __le__(self, other):
+        return self._data <= self._plain(other)
+
+    def __gt__(self, other):
+        return self._data > self._plain(other)
+
+    def __ge__(self, other):
+        return self._data >= self._plain(other)
+
+
+class CowDict(CowContainer, MutableMapping):
+    def _copy_data(self):
+        memo = {}
+        return {key: _shared_clone(value, memo) for key, value in self._data.items()}
+
+    def __getitem__(self, key):
+        value = self._readable(self._data[key])
+        return self._data[key] if value is None else value
+
+    def __iter__(self):
+        return iter(list(self._data))
+
+    def __setitem__(self, key, value):
+        self._materialize()
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        self._materialize()
+        del self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __or__(self, other):
+        return self.copy() | self._plain(other)
+
+    def __ror__(self, other):
+        return self._plain(other) | self.copy()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+
+# Клон значения в режиме CloneMode.Shared
+# memo: id оригинала -> клон, как у copy.deepcopy: сохраняет общие ссылки и защищает от циклов
+# У списков и словарей копируется только верхний уровень, элементы клонируются при первом чтении
+def _shared_clone(value, memo):
+    if _is_shareable(value):
+        return value
+    result = memo.get(id(value))
+    if result is not None:
+        return result
+    if isinstance(value, General):
+        cls = value.get_real_type()
+        result = memo[id(value)] = cls.__new__(cls)
+        _copy_shared_fields(result, value, memo)
+    elif isinstance(value, CowContainer):
+        result = memo[id(value)] = value.share()
+    elif isinstance(value, list):
+        result = memo[id(value)] = CowList(list(value))
+    elif isinstance(value, dict):
+        result = memo[id(value)] = CowDict(dict(value))
+    else:
+        result = copy.deepcopy(value, memo)
+    return result
+
+
+# Поля source в target в режиме CloneMode.Shared; поля из IMMUTABLE_FIELDS разделяются как есть
+def _copy_shared_fields(target, source, memo):
+    source_fields = _fields(source)
+    target_fields = _fields(target)
+    for key, value in source_fields.items():
+        target_fields[key] = value if key in source.IMMUTABLE_FIELDS else _shared_clone(value, memo)
+
+
+# Структурное сравнение графов объектов
+# Пары уже сравниваемых объектов запоминаются: это защищает от циклов и повторного обхода общих подграфов
+def _deep_equal(a, b, visited):
+    if a is b:
+        return True
+    if isinstance(a, FieldProxy):
+        a = a.unwrap()
+    if isinstance(b, FieldProxy):
+        b = b.unwrap()
+    if isinstance(a, General) and isinstance(b, General):
+        if not a.is_same_type(b):
+            return False
+        pair = (id(a), id(b))
+        if pair in visited:
+            return True
+        visited.add(pair)
+        return _FastPaths.of_object(a).compare(_fields(a), _fields(b), visited)
+    if type(a) is not type(b):
+        return a == b
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(_deep_equal(x, y, visited) for x, y in zip(a, b))
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_deep_equal(a[key], b[key], visited) for key in a)
+    return a == b
+
+
+# Кэш структурных хешей, заполняется методом General.structural_hash
+# Объекты без __hash__ или без слабых ссылок не кэшируются
+_STRUCTURAL_HASHES = weakref.WeakKeyDictionary()
+
+
+def _cached_structural_hash(obj):
+    try:
+        return _STRUCTURAL_HASHES.get(obj)
+    except TypeError:
+        return None
+
+
+STRUCTURAL_HASH_DEPTH = 8
+
+
+# Хеш согласован с _deep_equal: структурно равные графы имеют равные хеши
+# Хешируется развертка графа на depth уровней объектов General, поэтому равные графы с разными циклами
+# (a.next = a и b.next = c, c.next = b) дают одинаковый хеш; тип объекта не учитывается, так как
+# _deep_equal сравнивает и объекты подтипов. memo: (id объекта, глубина) -> хеш
+def _structural_hash(value, depth, memo):
+    if isinstance(value, FieldProxy):
+        value = value.unwrap()
+    if isinstance(value, General):
+        if depth == 0:
+            return 0
+        key = (id(value), depth)
+        result = memo.get(key)
+        if result is None:
+            fields = _fields(value)
+            result = memo[key] = hash(frozenset((name, _structural_hash(fields[name], depth - 1, memo))
+                                                for name in fields))
+        return result
+    if isinstance(value, (list, tuple)):
+        return hash((type(value), tuple(_structural_hash(element, depth, memo) for element in value)))
+    if isinstance(value, dict):
+        return hash(frozenset((key, _structural_hash(element, depth, memo)) for key, element in value.items()))
+    try:
+        return hash(value)
+    except TypeError:
+        return hash(type(value))
+
+
+# Специализированные функции копирования, сравнения и (де)сериализации для класса с заданным набором полей
+# Генерируются при первом использовании, как методы dataclasses, и кэшируются в классе по набору полей:
+# если набор полей объекта изменился, используется (или генерируется) другой вариант
+class _FastPaths:
+    MAX_PER_CLASS = 8
+
+    def __init__(self, cls, names):
+        keys = [repr(name) for name in names]
+        source = [
+            'def copy(target, source):',
+            *[f'    target[{key}] = _copy_value(source[{key}])' for key in keys],
+            '    pass',
+            'def assign(target, source):',
+            *[f'    target[{key}] = source[{key}]' for key in keys],
+            '    pass',
+            'def compare(a, b, visited):',
+            '    if a.keys() != b.keys():',
+            '        return False',
+            *[f'    x = a[{key}]\n    y = b[{key}]\n'
+              f'    if x is not y and not _deep_equal(x, y, visited):\n        return False' for key in keys],
+            '    return True',
+            'def to_fields(d):',
+            f'    return {{CLASS_KEY: tag, {", ".join(f"{key}: d[{key}]" for key in keys)}}}',
+            'def from_values(values):',
+            '    obj = cls.__new__(cls)',
+            '    d = _fields(obj)',
+            f'    ({"".join(f"d[{key}], " for key in keys)}) = values',
+            '    return _pooled(obj)' if issubclass(cls, Interned) else '    return obj',
+        ]
+        namespace = {'_fields': _fields, '_copy_value': _copy_value, '_deep_equal': _deep_equal, '_pooled': _pooled,
+                     'CLASS_KEY': CLASS_KEY, 'tag': str(cls), 'cls': cls}
+        exec('\n'.join(source), namespace)
+        self.copy = namespace['copy']
+        self.assign = namespace['assign']
+        self.compare = namespace['compare']
+        self.to_fields = namespace['to_fields']
+        self.from_values = namespace['from_values']
+
+    @classmethod
+    def of(cls, target_class, names):
+        cache = target_class.__dict__.get('_fast_paths')
+        if cache is None:
+            cache = {}
+            setattr(target_class, '_fast_paths', cache)
+        paths = cache.get(names)
+        if paths is None:
+            if len(cache) == cls.MAX_PER_CLASS:
+                cache.clear()
+            paths = cache[names] = _FastPaths(target_class, names)
+        return paths
+
+    @classmethod
+    def of_object(cls, obj):
+        return cls.of(type(obj), tuple(_fields(obj)))
+
+
+def _copy_value(value):
+    return value if isinstance(value, _IMMUTABLE_TYPES) else copy.deepcopy(value)
 
 
 # Базовый класс General, реализующий базовую функциональность для всех потомков
 # Класс использует рефлексию для выполнения базовых операций
 # Это позволяет применить методы ко всем потомкам без переопределения методов
 # Все методы объявлены абстрактными, поэтому нельзя создать экземпляр
+# Потомки могут объявить объекты неизменяемыми (IMMUTABLE) либо перечислить неизменяемые поля
+# (IMMUTABLE_FIELDS, с учетом искажения имен приватных полей) - такие значения не копируются
+# при копировании и клонировании в режиме CloneMode.Shared
 class General(ABC):
+    __slots__ = ()
+    IMMUTABLE = False
+    IMMUTABLE_FIELDS = frozenset()
+
+    # В режиме CloneMode.Shared неизменяемые значения разделяются, контейнеры копируются при записи
     @abstractmethod
-    def copy(self, other):
+    def copy(self, other, mode=CloneMode.Deep):
         if not self.is_same_type(other):
             raise TypeError('Tried to copy another type')
-        for key, value in other.__dict__.items():
-            self.__dict__[key] = copy.deepcopy(value)
+        if mode == CloneMode.Shared:
+            _copy_shared_fields(self, other, {id(other): self})
+            return
+        _FastPaths.of_object(other).copy(_fields(self), _fields(other))
 
     @abstractmethod
-    def clone(self):
-        return copy.deepcopy(self)
+    def clone(self, mode=CloneMode.Deep):
+        if mode == CloneMode.Deep:
+            return copy.deepcopy(self)
+        return _shared_clone(self, {})
 
+    # С use_cached_hashes графы, у корней которых уже посчитан structural_hash, сравниваются сначала по хешам:
+    # неравные хеши сразу дают False. Вызывающий отвечает за то, что кэшированные хеши не устарели
     @abstractmethod
-    def deep_compare(self, other):
-        if not self.is_same_type(other):
-            return False
-        for key, other_value in other.__dict__.items():
-            self_value = self.__dict__[key]
-            if isinstance(other_value, General) and not other_value.deep_compare(self_value):
-                return False
-            if self_value != other_value:
+    def deep_compare(self, other, use_cached_hashes=False):
+        if use_cached_hashes:
+            self_hash = _cached_structural_hash(self)
+            other_hash = _cached_structural_hash(other)
+            if self_hash is not None and other_hash is not None and self_hash != other_hash:
                 return False
-        return True
+        return _deep_equal(self, other, set())
+
+    # Хеш кэшируется; после изменения объекта или его подграфа нужно вызвать invalidate_structural_hash
+    def structural_hash(self):
+        result = _cached_structural_hash(self)
+        if result is None:
+            result = _structural_hash(self, STRUCTURAL_HASH_DEPTH, {})
+            try:
+                _STRUCTURAL_HASHES[self] = result
+            except TypeError:
+                pass
+        return result
+
+    def invalidate_structural_hash(self):
+        try:
+            _STRUCTURAL_HASHES.pop(self, None)
+        except TypeError:
+            pass
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        CLASS_REGISTRY.register(cls)
+
+    # Вызывается только для отсутствующих атрибутов: декодирует еще не прочитанное поле ленивого объекта
+    def __getattr__(self, name):
+        state = _LAZY_STATES.get(id(self)) if _LAZY_STATES else None
+        if state is None or name not in state.spans or name in state.decoded:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        return state.decode(self.__dict__, name)
+
+    # copy, deepcopy (и clone) и pickle видят только __dict__, поэтому поля ленивого объекта сначала декодируются
+    def __reduce_ex__(self, protocol):
+        _fields(self)
+        return super().__reduce_ex__(protocol)
+
+    # Если передан поток, объект записывается в него, иначе возвращаются данные кодека
     @abstractmethod
-    def serialize(self):
-        to_serialize = copy.deepcopy(self.__dict__)
-        to_serialize[CLASS_KEY] = str(self.get_real_type())
-        return json.dumps(to_serialize)
+    def serialize(self, stream=None, codec=JSON_CODEC):
+        if stream is None:
+            return codec.dumps(self)
+        codec.dump(self, stream)
+
+    # Сериализует список объектов General одним пакетом
+    @staticmethod
+    def serialize_many(objects, stream=None, codec=JSON_CODEC):
+        if stream is None:
+            return codec.dumps_many(objects)
+        codec.dump_many(objects, stream)
 
+    # Возвращает список объектов; data - данные кодека или поток
+    @staticmethod
+    def deserialize_many(data, codec=JSON_CODEC):
+        return codec.load_many(data) if hasattr(data, 'read') else codec.loads_many(data)
+
+    # data - данные кодека или поток
+    # В ленивом режиме поля декодируются при первом обращении к ним
     @abstractmethod
-    def deserialize(self, data):
-        to_deserialize = json.loads(data)
-        if str(self.get_real_type()) != to_deserialize[CLASS_KEY]:
+    def deserialize(self, data, codec=JSON_CODEC, lazy=False):
+        if lazy:
+            codec.load_lazy(self, data)
+            return
+        expected = self.get_real_type()
+        to_deserialize = codec.load(data, expected) if hasattr(data, 'read') else codec.loads(data, expected)
+        if not isinstance(to_deserialize, General) or to_deserialize.get_real_type() is not self.get_real_type():
             raise TypeError('Wrong deserialized class')
-        to_deserialize.pop(CLASS_KEY)
-        for key, value in to_deserialize.items():
-            self.__dict__[key] = value
+        _FastPaths.of_object(to_deserialize).assign(_fields(self), _fields(to_deserialize))
 
     @abstractmethod
     def print(self):
-        return self.get_real_type().__name__ + str(self.__dict__)
+        return self.get_real_type().__name__ + str(_fields(self))
 
     @abstractmethod
     def is_instance_of(self, cls):
@@ -74,20 +1126,22 @@ class General(ABC):
 
 # Класс Any не определяет новых методов, служит базовым классом для остальной иерархии
 class Any(General):
-    def copy(self, other):
-        super().copy(other)
+    __slots__ = ()
+
+    def copy(self, other, mode=CloneMode.Deep):
+        super().copy(other, mode)
 
-    def clone(self):
-        return super().clone()
+    def clone(self, mode=CloneMode.Deep):
+        return super().clone(mode)
 
-    def deep_compare(self, other):
-        return super().deep_compare(other)
+    def deep_compare(self, other, use_cached_hashes=False):
+        return super().deep_compare(other, use_cached_hashes)
 
-    def serialize(self):
-        return super().serialize()
+    def serialize(self, stream=None, codec=JSON_CODEC):
+        return super().serialize(stream, codec)
 
-    def deserialize(self, data):
-        super().deserialize(data)
+    def deserialize(self, data, codec=JSON_CODEC, lazy=False):
+        super().deserialize(data, codec, lazy)
 
     def print(self):
         return super().print()
@@ -105,16 +1159,145 @@ class Any(General):
         return super().assignment_attempt(source)
 
 
+# Компактный базовый класс: потомки объявляют поля в __slots__ и не имеют __dict__
+# Все методы General работают с полями-слотами так же, как с полями из __dict__
+class SlottedAny(Any):
+    __slots__ = ('__weakref__',)
+
+
+# Ограниченный пул разделяемых экземпляров, ключ - аргументы конструктора
+# Экземпляры хранятся по слабым ссылкам и удаляются из пула, когда перестают использоваться
+# Заполненный пул не растет: новые значения создаются как обычные объекты
+class InternPool:
+    DEFAULT_MAX_SIZE = 1 << 16
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.__instances = weakref.WeakValueDictionary()
+
+    def __len__(self):
+        return len(self.__instances)
+
+    def get(self, key):
+        return self.__instances.get(key)
+
+    def put(self, key, instance):
+        if len(self.__instances) < self.max_size:
+            self.__instances[key] = instance
+
+
+# Примесь для неизменяемых классов-значений: равные значения, созданные конструктором, - один объект
+# Объекты сравниваются и хешируются по intern_key, одинаковые объекты совпадают без сравнения полей
+# Копирование и клонирование возвращают тот же объект, запись в разделяемый объект (copy, deserialize) запрещена
+# Потомки должны хранить слабые ссылки (например, наследовать SlottedAny) и вернуть из intern_key
+# позиционные аргументы конструктора
+# Ключ пула учитывает типы аргументов: MyInteger(1), MyInteger(1.0) и MyInteger(True) - разные объекты
+class Interned:
+    __slots__ = ()
+    IMMUTABLE = True
+    INTERN_POOL_SIZE = InternPool.DEFAULT_MAX_SIZE
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._intern_pool = InternPool(cls.INTERN_POOL_SIZE)
+        init = cls.__dict__.get('__init__')
+        if init is not None:
+            cls.__init__ = _interned_init(init)
+        cls._intern_signature = inspect.signature(cls.__init__)
+        cls._intern_arity = sum(1 for parameter in list(cls._intern_signature.parameters.values())[1:]
+                                if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD))
+
+    # Именованные аргументы и пропущенные значения по умолчанию приводятся к позиционной форме
+    @classmethod
+    def _intern_pool_key(cls, args, kwargs):
+        if kwargs or len(args) != cls._intern_arity:
+            bound = cls._intern_signature.bind(None, *args, **kwargs)
+            bound.apply_defaults()
+            args = tuple(bound.arguments.values())[1:]
+        return tuple((type(arg), arg) for arg in args)
+
+    # Без аргументов объект создается протоколами копирования и десериализации и не интернируется
+    def __new__(cls, *args, **kwargs):
+        if len(args) == 0 and len(kwargs) == 0:
+            return super().__new__(cls)
+        instance = cls._intern_pool.get(cls._intern_pool_key(args, kwargs))
+        return super().__new__(cls) if instance is None else instance
+
+    # Объект, восстановленный кодеком, заменяется равным объектом из пула либо сам попадает в пул
+    def _interned(self):
+        cls = type(self)
+        key = cls._intern_pool_key(self.intern_key(), {})
+        instance = cls._intern_pool.get(key)
+        if instance is None:
+            cls._intern_pool.put(key, self)
+            return self
+        return instance
+
+    @abstractmethod
+    def intern_key(self):
+        pass
+
+    def __eq__(self, other):
+        return self is other or (type(other) is type(self) and self.intern_key() == other.intern_key())
+
+    def __hash__(self):
+        return hash(self.intern_key())
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return type(self), self.intern_key()
+
+    def copy(self, other, mode=CloneMode.Deep):
+        raise TypeError('Tried to copy into an interned object')
+
+    def deserialize(self, data, codec=JSON_CODEC, lazy=False):
+        raise TypeError('Tried to deserialize into an interned object')
+
+
+# Python вызывает __init__ и для объекта, возвращенного из пула; такой объект уже инициализирован
+# Новый объект попадает в пул после завершения конструктора самого производного класса
+def _interned_init(init):
+    @functools.wraps(init)
+    def __init__(self, *args, **kwargs):
+        cls = type(self)
+        key = cls._intern_pool_key(args, kwargs)
+        if cls._intern_pool.get(key) is self:
+            return
+        init(self, *args, **kwargs)
+        if cls.__init__ is __init__:
+            cls._intern_pool.put(key, self)
+    return __init__
+
+
+def _pooled(obj):
+    return obj._interned() if isinstance(obj, Interned) else obj
+
+
 class SupportsAddition(Protocol):
+    __slots__ = ()
+
     @abstractmethod
     def __add__(self, other: 'SupportsAddition') -> 'SupportsAddition':
         pass
 
 
-class MyInteger(SupportsAddition, Any):
+class MyInteger(Interned, SupportsAddition, SlottedAny):
+    __slots__ = ('__value',)
+
     def __init__(self, value: int):
         self.__value = value
 
+    def value(self):
+        return self.__value
+
+    def intern_key(self):
+        return (self.__value,)
+
     def __add__(self, other: 'MyInteger') -> 'MyInteger':
         return MyInteger(self.__value + other.__value)
 
@@ -128,31 +1311,218 @@ class MyInteger(SupportsAddition, Any):
 T = TypeVar('T', bound=SupportsAddition)
 
 
+# Отложенная сумма векторов одной длины: хранит слагаемые и вычисляется одним проходом при первом обращении
+# Слагаемые - хранилища векторов (массивы или списки); берутся только первые length элементов,
+# поэтому добавление элементов в исходные векторы после сложения не меняет результат
+class _LazySum(FieldProxy):
+    def __init__(self, terms, length):
+        self.__terms = terms
+        self.__length = length
+        self.__result = None
+
+    def __len__(self):
+        return self.__length
+
+    def __repr__(self):
+        return repr(self.unwrap())
+
+    # Слагаемые, если сумма еще не вычислена, иначе None
+    def terms(self):
+        return self.__terms
+
+    def unwrap(self):
+        if self.__result is None:
+            self.__result = self.__evaluate()
+            self.__terms = None
+        return self.__result
+
+    def __evaluate(self):
+        # В процессах пула сложение всегда последовательное
+        parallel = Vector.PARALLEL if multiprocessing.parent_process() is None else None
+        if all(isinstance(term, array) for term in self.__terms):
+            result = Vector.add_buffers(self.__terms, self.__length, parallel)
+            if result is not None:
+                return result
+        if parallel is None or not parallel.uses_processes(self.__length):
+            return _sum_columns(self.__terms, self.__length)
+        chunks = [[term[start:end] for term in self.__terms] for start, end in parallel.chunks(self.__length)]
+        result = []
+        for chunk in parallel.process_pool.map(_sum_columns, chunks):
+            result.extend(chunk)
+        return result
+
+
+# Поэлементная сумма первых length элементов слагаемых (всех, если length не задан)
+# В процессе пула вложенные суммы вычисляются здесь же последовательно
+def _sum_columns(terms, length=None):
+    columns = zip(*(islice(Vector.elements_of(term), length) for term in terms))
+    result = [functools.reduce(operator.add, column) for column in columns]
+    for element in result:
+        if isinstance(element, Vector):
+            element.evaluate()
+    return result
+
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+DEFAULT_PARALLEL_THRESHOLD = 1 << 22
+
+
+# Параллельное поэлементное сложение больших векторов: операнды делятся на куски по chunk_size элементов
+# Массивы int64 складываются в пуле потоков (numpy отпускает GIL), списки объектов - в пуле процессов
+# Векторы короче threshold, а также векторы без подходящего пула складываются последовательно
+class ParallelExecution:
+    def __init__(self, thread_pool=None, process_pool=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE, threshold=DEFAULT_PARALLEL_THRESHOLD):
+        self.thread_pool = thread_pool
+        self.process_pool = process_pool
+        self.chunk_size = chunk_size
+        self.threshold = threshold
+
+    def uses_threads(self, length):
+        return self.thread_pool is not None and length >= self.threshold
+
+    def uses_processes(self, length):
+        return self.process_pool is not None and length >= self.threshold
+
+    # Границы кусков [start, end)
+    def chunks(self, length):
+        return [(start, min(start + self.chunk_size, length)) for start in range(0, length, self.chunk_size)]
+
+
+# Вектор из MyInteger хранится как непрерывный массив int64 ('q'): сложение выполняется одной
+# векторной операцией (numpy, если установлен), объекты MyInteger создаются только при чтении элементов
+# Разнородные элементы и другие реализации SupportsAddition хранятся в списке
+# Параллельное вычисление сумм включается присваиванием Vector.PARALLEL = ParallelExecution(...)
 class Vector(Any, SupportsAddition, Generic[T]):
+    TYPECODE = 'q'
+    PARALLEL = None
+
     def __init__(self, data: list[T] = None):
-        self.__data = data if data is not None else list[T]()
+        self.__data = list[T]() if data is None else (self.__pack(data) or data)
+
+    # Массив значений, если все элементы - MyInteger в диапазоне int64, иначе None
+    @classmethod
+    def __pack(cls, elements):
+        if len(elements) == 0 or not all(type(element) is MyInteger for element in elements):
+            return None
+        try:
+            return array(cls.TYPECODE, [element.value() for element in elements])
+        except OverflowError:
+            return None
+
+    @staticmethod
+    def elements_of(data):
+        if isinstance(data, array):
+            return [MyInteger(value) for value in data]
+        return data
+
+    # Хранилище с вычисленной отложенной суммой
+    def __evaluated(self):
+        if isinstance(self.__data, _LazySum):
+            self.__data = self.__data.unwrap()
+        return self.__data
+
+    def __elements(self):
+        return self.elements_of(self.__evaluated())
+
+    # Слагаемые для отложенной суммы: невычисленная сумма разворачивается в свои слагаемые,
+    # вычисленная (например, при сериализации) дает свой результат
+    def __terms(self):
+        if isinstance(self.__data, _LazySum):
+            terms = self.__data.terms()
+            if terms is not None:
+                return terms
+            return [self.__frozen(self.__data.unwrap())]
+        return [self.__frozen(self.__data)]
+
+    # Слагаемое не должно зависеть от последующих push: сами массивы и списки обрезаются до длины суммы,
+    # а вложенные векторы заменяются снимками
+    @staticmethod
+    def __frozen(data):
+        if isinstance(data, array) or not any(isinstance(element, Vector) for element in data):
+            return data
+        return [element.__snapshot() if isinstance(element, Vector) else element for element in data]
+
+    # Отложенная копия вектора в его текущем состоянии: данные не копируются, а запоминаются с длиной
+    def __snapshot(self):
+        result = Vector()
+        result.__data = _LazySum(self.__terms(), len(self))
+        return result
+
+    def evaluate(self):
+        self.__evaluated()
+        return self
 
     def push(self, new_element: T):
+        if isinstance(self.__evaluated(), array):
+            if type(new_element) is MyInteger:
+                try:
+                    self.__data.append(new_element.value())
+                    return
+                except OverflowError:
+                    pass
+            self.__data = self.__elements()
+        elif len(self.__data) == 0:
+            packed = self.__pack([new_element])
+            if packed is not None:
+                self.__data = packed
+                return
         self.__data.append(new_element)
 
     def __len__(self):
         return len(self.__data)
 
+    # Сумма элементов [start, end) массивов int64 записывается в result, False при переполнении
+    @classmethod
+    def __add_range(cls, buffers, result, start, end):
+        if numpy is None:
+            values = memoryview(buffers[0])[start:end]
+            try:
+                for buffer in buffers[1:]:
+                    values = array(cls.TYPECODE, map(operator.add, values, memoryview(buffer)[start:end]))
+            except OverflowError:
+                return False
+            result[start:end] = array(cls.TYPECODE, values)
+            return True
+        out = numpy.frombuffer(result, dtype=numpy.int64, count=end - start, offset=start * result.itemsize)
+        out[:] = numpy.frombuffer(buffers[0], dtype=numpy.int64, count=end - start, offset=start * result.itemsize)
+        for buffer in buffers[1:]:
+            term = numpy.frombuffer(buffer, dtype=numpy.int64, count=end - start, offset=start * result.itemsize)
+            previous = out.copy()
+            numpy.add(out, term, out=out)
+            if numpy.any((previous ^ out) & (term ^ out) < 0):
+                return False
+        return True
+
+    # Сумма первых length элементов массивов int64, None при переполнении
+    # Куски результата пишутся на свои места в заранее выделенный массив, склейка не копирует данные
+    @classmethod
+    def add_buffers(cls, buffers, length, parallel=None):
+        result = array(cls.TYPECODE, bytes(length * array(cls.TYPECODE).itemsize))
+        if parallel is None or not parallel.uses_threads(length):
+            done = [cls.__add_range(buffers, result, 0, length)]
+        else:
+            done = parallel.thread_pool.map(lambda bounds: cls.__add_range(buffers, result, *bounds),
+                                            parallel.chunks(length))
+        return result if all(done) else None
+
+    # Результат вычисляется при первом обращении к элементам или вызове evaluate()
     def __add__(self, other: 'Vector[T]') -> 'Vector[T]':
         if self == Void() or other == Void() or len(self) != len(other):
             return Void()
         result = Vector()
-        result.__data = [a + b for a, b in zip(self.__data, other.__data)]
+        result.__data = _LazySum(self.__terms() + other.__terms(), len(self))
         return result
 
     def __str__(self):
-        return '[' + ', '.join([repr(element) for element in self.__data]) + ']'
+        return '[' + ', '.join([repr(element) for element in self.__elements()]) + ']'
 
     def __repr__(self):
-        return 'Vector{' + ', '.join([repr(element) for element in self.__data]) + '}'
+        return 'Vector{' + ', '.join([repr(element) for element in self.__elements()]) + '}'
 
 
 class Void(Any):
+    IMMUTABLE = True
     _instance = None
 
     def __new__(cls):
@@ -1,6 +1,9 @@
+from abc import ABC, abstractmethod
+
+
 # Плохой дизайн с использованием флагов:
 class Viewer:
-    def __init__(self, mature_contend_allowed=true, shocking_content_allowed=true):
+    def __init__(self, mature_contend_allowed=True, shocking_content_allowed=True):
         self.__mature_content_allowed = mature_contend_allowed
         self.__shocking_content_allowed = shocking_content_allowed
 
@@ -27,37 +30,67 @@ class Viewer:
 # Полиморфный дизайн
 # Не очень хороший пример получился, тут больше подходит паттерн "Декоратор" или что-то подобное.
 # Но для демонстрации отвязки от "флагов" и использования иерархии для изменения поведения, подходит.
+# Контент отдается генератором: фильтры всех предков объединяются в один проход,
+# элементы проверяются по одному и не собираются в список
 class Viewer:
+    # Итератор по элементам ленты
     def __get_content(self):
-        pass
+        return iter(())
+
+    # Фильтры зрителя, потомки дополняют список фильтров предков
+    def _filters(self):
+        return []
 
     def get_subscribed_content(self):
-        result = self.__get_content()
-        return result
+        content = self.__get_content()
+        tests = [content_filter.accepts for content_filter in sorted(self._filters(), key=ContentFilter.rank)]
+        if len(tests) == 0:
+            return content
+        return (item for item in content if all(test(item) for test in tests))
 
 
-class FilteredViewer(Viewer):
-    @abstractMethod
-    def __filter(self, content):
-        pass
+# Фильтр контента: предикат с оценкой стоимости проверки и доли пропускаемых элементов
+class ContentFilter:
+    def __init__(self, accepts, cost=1.0, pass_rate=0.5):
+        self.accepts = accepts
+        self.cost = cost
+        self.pass_rate = pass_rate
+
+    # Первыми проверяются дешевые фильтры, отсекающие больше всего элементов
+    def rank(self):
+        return self.cost / max(1.0 - self.pass_rate, 1e-9)
 
-    def get_subscribed_content(self):
-        return self.__filter(super().get_subscribed_content())
 
+class FilteredViewer(Viewer, ABC):
+    @abstractmethod
+    def _filters(self):
+        return super()._filters()
 
+
+# Элемент ленты - словарь с возрастным рейтингом ('rating') и текстом ('text')
+ADULT_RATING = 18
+SHOCKING_WORDS = ('blood', 'gore', 'violence')
+
+
+# Возрастной рейтинг есть в метаданных, проверка дешевая
 class MatureForbiddenViewer(FilteredViewer):
-    def __filter(self, content):
-        pass
+    def __accepts(self, item):
+        return item.get('rating', 0) < ADULT_RATING
+
+    def _filters(self):
+        return super()._filters() + [ContentFilter(self.__accepts, cost=1.0, pass_rate=0.8)]
 
 
+# Шокирующий контент определяется анализом самого контента, проверка дорогая
 class ShockingForbiddenViewer(FilteredViewer):
-    def __filter(self, content):
-        pass
+    def __accepts(self, item):
+        text = item.get('text', '').lower()
+        return not any(word in text for word in SHOCKING_WORDS)
+
+    def _filters(self):
+        return super()._filters() + [ContentFilter(self.__accepts, cost=20.0, pass_rate=0.95)]
 
 
+# Фильтры обоих предков собираются через super() и применяются за один проход
 class ChildViewer(MatureForbiddenViewer, ShockingForbiddenViewer):
-    def get_subscribed_content(self):
-        result = super().get_subscribed_content()
-        result = MatureForbiddenViewer.__filter(result)
-        result = ShockingForbiddenViewer.__filter(result)
-        return result
+    pass